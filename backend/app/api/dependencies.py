@@ -1,18 +1,125 @@
 from functools import lru_cache
-from typing import Generator
+from typing import Generator, Optional
 from app.domain.interfaces import NewsClient, AIService, MarketDataProvider
 from app.infrastructure.external.news_client import NewsClientImpl
 from app.infrastructure.external.openai_client import AIServiceImpl
 from app.infrastructure.external.market_client import MarketDataProviderImpl
+from app.infrastructure.price_hub import PriceHub
+from app.infrastructure.price_feed import RemotePriceHub
+from app.infrastructure.http import HttpClientPool
+from app.infrastructure.cache import AsyncTTLCache
+from app.infrastructure.resilience import TokenBucket, coingecko_limiter, newsapi_limiter
+from app.infrastructure.tick_store import TickStore
+from app.infrastructure.sentiment import SentimentCache, SentimentEnricher
+from app.infrastructure.news_ingester import NewsIngester
+from app.core.config import settings
+from app.core.concurrency import AdmissionLimiter
+
+@lru_cache()
+def get_http_pool() -> HttpClientPool:
+    return HttpClientPool()
+
+@lru_cache()
+def get_history_cache() -> AsyncTTLCache:
+    return AsyncTTLCache(
+        max_entries=settings.MARKET_HISTORY_CACHE_MAX_ENTRIES,
+        max_bytes=settings.MARKET_HISTORY_CACHE_MAX_BYTES,
+        stale_ttl=settings.MARKET_HISTORY_STALE_TTL,
+        name="price_history"
+    )
+
+@lru_cache()
+def get_tick_store() -> Optional[TickStore]:
+    if not settings.TICK_STORE_ENABLED:
+        return None
+    return TickStore(
+        settings.TICK_STORE_DIR,
+        bar_seconds=settings.TICK_STORE_BAR_SECONDS,
+        raw_retention_seconds=settings.TICK_STORE_RAW_RETENTION_SECONDS,
+        # With a feed process, it is the only writer
+        read_only=settings.MARKET_FEED_MODE == "remote"
+    )
+
+def _feed_workers() -> int:
+    return max(1, settings.MARKET_FEED_WORKERS) if settings.MARKET_FEED_MODE == "remote" else 1
+
+@lru_cache()
+def get_newsapi_limiter() -> TokenBucket:
+    if _feed_workers() == 1:
+        return newsapi_limiter
+    # Every worker ingests news itself; together they stay within one budget
+    return TokenBucket(
+        "newsapi",
+        rate_per_minute=settings.NEWSAPI_RATE_PER_MINUTE / _feed_workers(),
+        burst=max(1, settings.NEWSAPI_BURST // _feed_workers())
+    )
 
 @lru_cache()
 def get_news_client() -> NewsClient:
-    return NewsClientImpl()
+    return NewsClientImpl(get_http_pool(), limiter=get_newsapi_limiter())
 
 @lru_cache()
 def get_ai_service() -> AIService:
     return AIServiceImpl()
 
+@lru_cache()
+def get_ai_limiter() -> AdmissionLimiter:
+    return AdmissionLimiter(
+        "AI service",
+        max_concurrency=settings.AI_MAX_CONCURRENCY,
+        max_queue=settings.AI_MAX_QUEUE,
+        queue_timeout=settings.AI_QUEUE_TIMEOUT,
+        retry_after=settings.AI_RETRY_AFTER_SECONDS
+    )
+
+@lru_cache()
+def get_sentiment_cache() -> SentimentCache:
+    return SentimentCache(settings.SENTIMENT_CACHE_PATH, max_entries=settings.SENTIMENT_CACHE_MAX_ENTRIES)
+
+@lru_cache()
+def get_sentiment_enricher() -> SentimentEnricher:
+    return SentimentEnricher(
+        get_ai_service(),
+        get_sentiment_cache(),
+        batch_size=settings.SENTIMENT_BATCH_SIZE,
+        max_concurrency=settings.SENTIMENT_MAX_CONCURRENCY
+    )
+
+@lru_cache()
+def get_news_ingester() -> NewsIngester:
+    return NewsIngester(
+        get_news_client(),
+        get_sentiment_enricher(),
+        capacity=settings.NEWS_RING_SIZE,
+        page_size=settings.NEWS_PAGE_SIZE,
+        max_pages=settings.NEWS_MAX_PAGES,
+        # N workers polling N times less often put one process's load on NewsAPI
+        interval=settings.NEWS_POLL_INTERVAL * _feed_workers()
+    )
+
+@lru_cache()
+def get_coingecko_limiter() -> TokenBucket:
+    if settings.MARKET_FEED_MODE != "remote":
+        return coingecko_limiter
+    # Every worker has its own bucket; together they stay within their share
+    workers = _feed_workers()
+    return TokenBucket(
+        "coingecko",
+        rate_per_minute=settings.COINGECKO_RATE_PER_MINUTE * settings.MARKET_FEED_WORKER_BUDGET / workers,
+        burst=max(1, settings.COINGECKO_BURST // workers)
+    )
+
 @lru_cache()
 def get_market_provider() -> MarketDataProvider:
-    return MarketDataProviderImpl()
+    return MarketDataProviderImpl(
+        get_http_pool(), get_history_cache(), get_tick_store(), limiter=get_coingecko_limiter()
+    )
+
+@lru_cache()
+def get_price_hub() -> PriceHub:
+    if settings.MARKET_FEED_MODE == "remote":
+        return RemotePriceHub(
+            settings.MARKET_FEED_SOCKET,
+            reconnect_delay=settings.MARKET_FEED_RECONNECT_DELAY
+        )
+    return PriceHub(get_market_provider())
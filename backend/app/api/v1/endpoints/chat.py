@@ -1,7 +1,14 @@
+import time
+from typing import AsyncIterator, Optional
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 from app.domain.interfaces import AIService
 from app.api import dependencies
+from app.core.concurrency import AdmissionLimiter
+from app.core.logger import logger
+from app.core.metrics import CHAT_TIME_TO_FIRST_TOKEN
 
 router = APIRouter()
 
@@ -14,11 +21,17 @@ class ChatResponse(BaseModel):
 @router.post("/", response_model=ChatResponse)
 async def chat_endpoint(
     request: ChatRequest,
-    ai_service: AIService = Depends(dependencies.get_ai_service)
+    ai_service: AIService = Depends(dependencies.get_ai_service),
+    limiter: AdmissionLimiter = Depends(dependencies.get_ai_limiter)
 ):
     """
     Process a user message and return an AI response.
     """
+    # Sheds load with 503 + Retry-After when the AI queue is full
+    async with limiter.slot():
+        return await _complete_chat(request, ai_service)
+
+async def _complete_chat(request: ChatRequest, ai_service: AIService) -> ChatResponse:
     try:
         # In a real app, you might pass history or context here.
         # For now, we'll just treat it as a single query for sentiment/analysis.
@@ -40,3 +53,55 @@ async def chat_endpoint(
         return ChatResponse(response=response_text)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+def _sse(data: str, event: Optional[str] = None) -> str:
+    # Multi-line payloads need one "data:" field per line
+    lines = [f"event: {event}"] if event else []
+    lines += [f"data: {line}" for line in data.split("\n")]
+    return "\n".join(lines) + "\n\n"
+
+@router.post("/stream")
+async def chat_stream_endpoint(
+    request: ChatRequest,
+    ai_service: AIService = Depends(dependencies.get_ai_service),
+    limiter: AdmissionLimiter = Depends(dependencies.get_ai_limiter)
+):
+    """
+    Stream the AI response as server-sent events, one chunk per event,
+    followed by a final `done` event.
+    """
+    # Admission happens before the response starts so overload is a clean 503
+    await limiter.acquire()
+    released = False
+
+    def _release_once() -> None:
+        nonlocal released
+        if not released:
+            released = True
+            limiter.release()
+
+    accepted_at = time.perf_counter()
+
+    async def _events() -> AsyncIterator[str]:
+        first = True
+        try:
+            async for chunk in ai_service.stream_chat(request.message):
+                if first:
+                    CHAT_TIME_TO_FIRST_TOKEN.observe(time.perf_counter() - accepted_at)
+                    first = False
+                yield _sse(chunk)
+            yield _sse("", event="done")
+        except Exception as e:
+            logger.error(f"Chat stream error: {e}")
+            yield _sse("AI service error", event="error")
+        finally:
+            # Held for the whole stream, released on completion or client disconnect
+            _release_once()
+
+    return StreamingResponse(
+        _events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Covers responses whose body never started streaming
+        background=BackgroundTask(_release_once)
+    )
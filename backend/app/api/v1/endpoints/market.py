@@ -1,58 +1,248 @@
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse
 import asyncio
 import json
-from dataclasses import asdict
+import time
+from datetime import timezone
+from typing import Any, Dict, Optional, Set
 from app.api import dependencies
 from app.domain.interfaces import MarketDataProvider
+from app.domain.models import MarketTicker
+from app.infrastructure.price_hub import PriceHub, ConflatingOutbox
+from app.infrastructure.cache import AsyncTTLCache
+from app.core.config import settings
 from app.core.logger import logger
+from app.core.metrics import WS_CONNECTIONS, WS_SEND_LAG, WS_CONFLATED, symbol_label
+
+try:
+    import msgpack
+except ImportError:  # binary frames are optional
+    msgpack = None
 
 router = APIRouter()
 
 @router.get("/history/{symbol}")
 async def get_history(
     symbol: str,
-    days: int = 1,
+    days: int = Query(1, ge=1, le=365),
+    max_points: Optional[int] = Query(None, ge=3, description="Downsample to at most this many points (LTTB)"),
     market_provider: MarketDataProvider = Depends(dependencies.get_market_provider)
 ):
     """
     Get historical price data.
     """
     history = await market_provider.get_price_history(symbol, days)
-    # Serialize results
-    results = []
-    for item in history:
-        d = asdict(item)
-        d["timestamp"] = d["timestamp"].isoformat()
-        results.append(d)
-    return results
+    if max_points is not None:
+        history = history.downsample(max_points)
+    # Records are already JSON-native; skip the generic encoder
+    return JSONResponse(content=history.to_records())
+
+@router.get("/history/cache/stats")
+async def get_history_cache_stats(
+    cache: AsyncTTLCache = Depends(dependencies.get_history_cache)
+):
+    """
+    Hit/miss counters for the price history cache (for sizing).
+    """
+    return cache.stats()
+
+@router.get("/snapshot")
+async def get_snapshot(
+    symbols: str = Query(..., description="Comma-separated symbols, e.g. BTC-USD,ETH-USD"),
+    market_provider: MarketDataProvider = Depends(dependencies.get_market_provider)
+):
+    """
+    Latest prices for many symbols in a single round trip.
+    """
+    requested = list(dict.fromkeys(s.strip() for s in symbols.split(",") if s.strip()))
+    if not requested:
+        raise HTTPException(status_code=400, detail="No symbols requested")
+    if len(requested) > settings.MARKET_BATCH_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.MARKET_BATCH_MAX_IDS} symbols per snapshot"
+        )
+
+    return await market_provider.get_latest_prices(requested)
 
 @router.websocket("/ws/{symbol}")
 async def websocket_endpoint(
     websocket: WebSocket,
     symbol: str,
-    market_provider: MarketDataProvider = Depends(dependencies.get_market_provider)
+    hub: PriceHub = Depends(dependencies.get_price_hub)
 ):
     """
     Streams real-time market data for a given symbol.
+    Ticks come from the shared PriceHub, which polls upstream once per symbol.
     """
     await websocket.accept()
     logger.info(f"WebSocket connected for {symbol}")
+    outbox = ConflatingOutbox()
+    hub.subscribe(symbol, outbox)
+    connections = WS_CONNECTIONS.labels(symbol=symbol_label(symbol))
+    send_lag = WS_SEND_LAG.labels(symbol=symbol_label(symbol))
+    connections.inc()
     
     try:
         while True:
-            # Generate ticker data
-            ticker = await market_provider.generate_ticker(symbol)
-            data = asdict(ticker)
-            # Serialize datetime
-            data["timestamp"] = data["timestamp"].isoformat()
-            
-            await websocket.send_json(data)
-            
-            # Real API has rate limits (CoinGecko free: ~10-30 req/min)
-            await asyncio.sleep(5.0)
+            _, ticks = await outbox.drain()
+            for tick in ticks:
+                # Already serialized once by the hub for all subscribers; a client
+                # that can't take it within WS_SEND_TIMEOUT is dropped
+                await asyncio.wait_for(
+                    websocket.send_text(tick.message), timeout=settings.WS_SEND_TIMEOUT
+                )
+                send_lag.observe(time.monotonic() - tick.published_at)
             
     except WebSocketDisconnect:
         logger.info(f"WebSocket disconnected for {symbol}")
+    except asyncio.TimeoutError:
+        # Closing would need another send to the stalled client; just drop it
+        logger.warning(f"Dropping slow WebSocket client for {symbol}")
     except Exception as e:
         logger.error(f"WebSocket error: {e}")
         await websocket.close()
+    finally:
+        connections.dec()
+        WS_CONFLATED.inc(outbox.conflated)
+        hub.unsubscribe(symbol, outbox)
+
+def _compact(ticker: MarketTicker) -> Dict[str, Any]:
+    return {
+        "s": ticker.symbol,
+        "p": ticker.price,
+        "c": ticker.change_24h,
+        "v": ticker.volume,
+        "ts": int(ticker.timestamp.replace(tzinfo=timezone.utc).timestamp() * 1000),
+    }
+
+def _delta(current: Dict[str, Any], previous: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    # First update for a symbol is complete; later ones carry only changed fields
+    if previous is None:
+        return current
+    return {k: v for k, v in current.items() if k == "s" or previous.get(k) != v}
+
+@router.websocket("/ws")
+async def multiplexed_websocket_endpoint(
+    websocket: WebSocket,
+    format: str = "json",
+    hub: PriceHub = Depends(dependencies.get_price_hub)
+):
+    """
+    One socket, many symbols.
+
+    Client -> server (JSON text):
+        {"op": "subscribe", "symbols": ["BTC-USD", "ETH-USD"]}
+        {"op": "unsubscribe", "symbols": ["ETH-USD"]}
+
+    Server -> client (JSON text, or msgpack binary with `?format=msgpack`):
+        {"t": "subscribed" | "unsubscribed", "symbols": [...]}
+        {"t": "error", "msg": "..."}
+        {"t": "ticks", "d": [{"s": "BTC-USD", "p": 45000.1, "c": 1.2, "v": 9.9, "ts": 1700000000000}]}
+
+    Tick entries are deltas: after the first update for a symbol only the
+    fields that changed are sent. A slow client gets the latest tick per
+    symbol (older unsent ones are conflated away) and is disconnected if a
+    single frame takes longer than WS_SEND_TIMEOUT. Compression is
+    negotiated by the server (uvicorn enables permessage-deflate by default).
+    """
+    await websocket.accept()
+    if format not in ("json", "msgpack") or (format == "msgpack" and msgpack is None):
+        await websocket.send_json({"t": "error", "msg": f"Unsupported format '{format}'"})
+        await websocket.close(code=1003)
+        return
+
+    outbox = ConflatingOutbox()
+    subscriptions: Set[str] = set()
+    # Unsubscribed symbols whose delta state the sender must forget
+    resets: Set[str] = set()
+    receiver = asyncio.create_task(_receive_commands(websocket, hub, outbox, subscriptions, resets))
+    sender = asyncio.create_task(_send_updates(websocket, outbox, resets, binary=format == "msgpack"))
+    try:
+        # Whichever side ends first (client gone, bad frame, send timeout) ends the session
+        done, _ = await asyncio.wait({receiver, sender}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            error = task.exception()
+            if error is not None and not isinstance(error, WebSocketDisconnect):
+                logger.error(f"WebSocket error: {error}")
+                await websocket.close(code=1011)
+    finally:
+        # Not awaited: this may run while the endpoint itself is being cancelled
+        receiver.cancel()
+        sender.cancel()
+        for symbol in subscriptions:
+            hub.unsubscribe(symbol, outbox)
+            WS_CONNECTIONS.labels(symbol=symbol_label(symbol)).dec()
+        WS_CONFLATED.inc(outbox.conflated)
+
+async def _receive_commands(
+    websocket: WebSocket, hub: PriceHub, outbox: ConflatingOutbox,
+    subscriptions: Set[str], resets: Set[str]
+) -> None:
+    while True:
+        try:
+            command = json.loads(await websocket.receive_text())
+            op = command["op"]
+            symbols = [str(s) for s in command.get("symbols", [])]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            outbox.notify({"t": "error", "msg": "Expected {\"op\": ..., \"symbols\": [...]}"})
+            continue
+
+        if op == "subscribe":
+            new = [s for s in dict.fromkeys(symbols) if s not in subscriptions]
+            if len(subscriptions) + len(new) > settings.WS_MAX_SYMBOLS_PER_CLIENT:
+                outbox.notify({
+                    "t": "error",
+                    "msg": f"At most {settings.WS_MAX_SYMBOLS_PER_CLIENT} symbols per connection"
+                })
+                continue
+            for symbol in new:
+                subscriptions.add(symbol)
+                hub.subscribe(symbol, outbox)
+                WS_CONNECTIONS.labels(symbol=symbol_label(symbol)).inc()
+            outbox.notify({"t": "subscribed", "symbols": sorted(subscriptions)})
+        elif op == "unsubscribe":
+            for symbol in symbols:
+                if symbol in subscriptions:
+                    subscriptions.discard(symbol)
+                    resets.add(symbol)
+                    hub.unsubscribe(symbol, outbox)
+                    WS_CONNECTIONS.labels(symbol=symbol_label(symbol)).dec()
+            outbox.notify({"t": "unsubscribed", "symbols": symbols})
+        else:
+            outbox.notify({"t": "error", "msg": f"Unknown op '{op}'"})
+
+async def _send_updates(
+    websocket: WebSocket, outbox: ConflatingOutbox, resets: Set[str], binary: bool
+) -> None:
+    last_sent: Dict[str, Dict[str, Any]] = {}
+
+    async def _send(payload: Dict[str, Any]) -> None:
+        if binary:
+            frame = websocket.send_bytes(msgpack.packb(payload))
+        else:
+            frame = websocket.send_text(json.dumps(payload, separators=(",", ":")))
+        # Backpressure: a client that can't take one frame in time is dropped
+        await asyncio.wait_for(frame, timeout=settings.WS_SEND_TIMEOUT)
+
+    while True:
+        control, ticks = await outbox.drain()
+        for message in control:
+            await _send(message)
+        # A resubscribed symbol starts over with a complete update
+        for symbol in resets:
+            last_sent.pop(symbol, None)
+        resets.clear()
+        if not ticks:
+            continue
+
+        updates = []
+        for tick in ticks:
+            current = _compact(tick.ticker)
+            updates.append(_delta(current, last_sent.get(tick.symbol)))
+            last_sent[tick.symbol] = current
+        await _send({"t": "ticks", "d": updates})
+
+        now = time.monotonic()
+        for tick in ticks:
+            WS_SEND_LAG.labels(symbol=symbol_label(tick.symbol)).observe(now - tick.published_at)
@@ -1,38 +1,53 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from typing import List, Any
 from app.domain.models import NewsItem
 from app.api import dependencies
-from app.domain.interfaces import NewsClient, AIService
+from app.core.config import settings
+from app.domain.interfaces import NewsClient
+from app.infrastructure.sentiment import SentimentEnricher, content_hash, sentiment_label
+from app.infrastructure.news_ingester import NewsIngester
 
 router = APIRouter()
 
 @router.get("/", response_model=List[NewsItem])
 async def read_news(
-    limit: int = 10,
+    limit: int = Query(10, ge=1, le=settings.NEWS_RING_SIZE),
+    ingester: NewsIngester = Depends(dependencies.get_news_ingester),
     news_client: NewsClient = Depends(dependencies.get_news_client),
-    ai_service: AIService = Depends(dependencies.get_ai_service)
+    enricher: SentimentEnricher = Depends(dependencies.get_sentiment_enricher)
 ) -> Any:
     """
     Retrieve latest financial news with AI sentiment analysis.
     """
+    # Served from the background ingester's ring; no upstream call on the request path
+    news_items = ingester.latest(limit)
+    if news_items:
+        return news_items
+
+    # Nothing ingested yet (e.g. right after startup): fetch directly once
     news_items = await news_client.fetch_latest_news(limit=limit)
     
-    # Enrich with AI if needed? 
-    # The client might fetch already enriched news OR we do it here.
-    # For MVP, assume client returns already enriched or we do a quick pass.
-    # Let's assume client handles it or returns mock data.
-    
-    return news_items
+    # Batched, cached scoring: headlines seen before cost nothing
+    return await enricher.enrich(news_items)
 
 @router.get("/{news_id}/analyze")
 async def analyze_news_item(
     news_id: str,
-    ai_service: AIService = Depends(dependencies.get_ai_service)
+    ingester: NewsIngester = Depends(dependencies.get_news_ingester),
+    enricher: SentimentEnricher = Depends(dependencies.get_sentiment_enricher)
 ):
     """
-    On-demand analysis of a specific news item (stub).
+    On-demand analysis of an ingested news item.
     """
-    # Logic to fetch text by ID (omitted for MVP, using mock text)
-    mock_text = "Market is crashing due to unexpected inflation data."
-    sentiment = await ai_service.analyze_sentiment(mock_text)
-    return {"id": news_id, "sentiment": sentiment}
+    item = ingester.get(news_id)
+    if item is None:
+        raise HTTPException(status_code=404, detail="News item not found")
+
+    text = f"{item.title}\n{item.summary or ''}"
+    key = content_hash(text)
+    scores = await enricher.score({key: text})
+    if key not in scores:
+        raise HTTPException(status_code=503, detail="Sentiment analysis unavailable")
+
+    sentiment = scores[key]
+    return {"id": news_id, "title": item.title, "sentiment": sentiment, "label": sentiment_label(sentiment)}
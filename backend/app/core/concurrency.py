@@ -0,0 +1,62 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from app.core.exceptions import ServiceOverloadedError
+
+
+class AdmissionLimiter:
+    """
+    Caps concurrent work with a bounded wait queue.
+
+    Up to `max_concurrency` callers run at once and up to `max_queue` more
+    wait for a slot (at most `queue_timeout` seconds). Anyone beyond that
+    is rejected immediately with ServiceOverloadedError, so a spike sheds
+    load instead of piling up on the event loop.
+    """
+
+    def __init__(self, name: str, max_concurrency: int, max_queue: int,
+                 queue_timeout: float, retry_after: int):
+        self.name = name
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._max_queue = max_queue
+        self._queue_timeout = queue_timeout
+        self._retry_after = retry_after
+        self._waiting = 0
+        self._active = 0
+        self.rejected = 0
+
+    @property
+    def active(self) -> int:
+        return self._active
+
+    @property
+    def waiting(self) -> int:
+        return self._waiting
+
+    async def acquire(self) -> None:
+        if self._semaphore.locked() and self._waiting >= self._max_queue:
+            self.rejected += 1
+            raise ServiceOverloadedError(f"{self.name} is at capacity", retry_after=self._retry_after)
+
+        self._waiting += 1
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self._queue_timeout)
+        except asyncio.TimeoutError:
+            self.rejected += 1
+            raise ServiceOverloadedError(f"{self.name} queue wait timed out", retry_after=self._retry_after)
+        finally:
+            self._waiting -= 1
+        self._active += 1
+
+    def release(self) -> None:
+        self._active -= 1
+        self._semaphore.release()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[None]:
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
@@ -16,6 +16,108 @@ class Settings(BaseSettings):
     # Feature Flags
     USE_MOCK_DATA: bool = False
 
+    # Upstream endpoints (overridable to point at local stand-ins, e.g. benchmarks)
+    COINGECKO_BASE_URL: str = "https://api.coingecko.com/api/v3"
+    NEWSAPI_BASE_URL: str = "https://newsapi.org/v2"
+
+    # Outbound HTTP (shared pooled clients, one per upstream host)
+    HTTP2_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 3.0
+    HTTP_READ_TIMEOUT: float = 10.0
+    HTTP_POOL_TIMEOUT: float = 5.0
+
+    # News ingestion (background polling)
+    NEWS_QUERY: str = "crypto"
+    NEWS_POLL_INTERVAL: float = 60.0
+    NEWS_PAGE_SIZE: int = 50
+    NEWS_MAX_PAGES: int = 5  # pages fetched per poll when more than one page of articles is new
+    NEWS_RING_SIZE: int = 500  # most recent articles kept in memory
+
+    # News sentiment enrichment
+    SENTIMENT_BATCH_SIZE: int = 16  # headlines scored per model call
+    SENTIMENT_MAX_CONCURRENCY: int = 4
+    SENTIMENT_CACHE_PATH: Optional[str] = "data/sentiment.sqlite3"
+    SENTIMENT_CACHE_MAX_ENTRIES: int = 10_000  # scores kept in memory; the rest stay on disk
+
+    # AI admission control (chat)
+    AI_MAX_CONCURRENCY: int = 8
+    AI_MAX_QUEUE: int = 32
+    AI_QUEUE_TIMEOUT: float = 10.0
+    AI_RETRY_AFTER_SECONDS: int = 2
+
+    # Observability
+    EVENT_LOOP_LAG_INTERVAL: float = 0.5  # seconds between event-loop lag probes
+    PROFILER_ENABLED: bool = False  # allow the runtime sampling profiler endpoints
+    # Symbols that get their own metric labels; any other symbol is counted as "other"
+    METRICS_SYMBOLS: List[str] = ["BTC-USD", "ETH-USD", "SOL-USD", "DOGE-USD", "NG=F", "CL=F"]
+
+    # Upstream resilience (circuit breakers + token-bucket rate limits)
+    BREAKER_FAIL_MAX: int = 3
+    BREAKER_RESET_TIMEOUT: float = 60.0
+    COINGECKO_RATE_PER_MINUTE: float = 30.0  # free tier allows roughly 30 req/min
+    COINGECKO_BURST: int = 5
+    NEWSAPI_RATE_PER_MINUTE: float = 6.0
+    NEWSAPI_BURST: int = 2
+    RATE_LIMIT_MAX_WAIT: float = 1.0  # seconds to wait for a token before falling back
+
+    # Market Streaming
+    MARKET_POLL_INTERVAL: float = 5.0  # seconds between upstream polls per symbol
+    WS_MAX_SYMBOLS_PER_CLIENT: int = 50
+    WS_SEND_TIMEOUT: float = 10.0  # clients that can't take a frame this long are dropped
+
+    # Multi-worker tick distribution
+    # "local": each process polls upstream itself (single worker)
+    # "remote": web workers receive ticks from the feed process (python -m app.feed)
+    MARKET_FEED_MODE: str = "local"
+    MARKET_FEED_SOCKET: str = "data/price-feed.sock"
+    MARKET_FEED_RECONNECT_DELAY: float = 1.0
+    MARKET_FEED_METRICS_PORT: Optional[int] = None  # Prometheus port for the feed process
+    # In remote mode the feed and the web workers share one CoinGecko budget
+    # (COINGECKO_RATE_PER_MINUTE): workers get this share for history and
+    # snapshot requests, split evenly between MARKET_FEED_WORKERS of them
+    MARKET_FEED_WORKERS: int = 1
+    MARKET_FEED_WORKER_BUDGET: float = 0.5
+
+    # CoinGecko price batching
+    MARKET_BATCH_WINDOW: float = 0.05  # seconds to gather lookups into one request
+    MARKET_BATCH_MAX_IDS: int = 50
+
+    # Price history cache (TTL in seconds, by requested range)
+    MARKET_HISTORY_TTL_INTRADAY: float = 60.0
+    MARKET_HISTORY_TTL_MONTH: float = 900.0
+    MARKET_HISTORY_TTL_LONG: float = 3600.0
+    MARKET_HISTORY_STALE_TTL: float = 3600.0  # serve stale while refreshing in background
+    MARKET_HISTORY_CACHE_MAX_ENTRIES: int = 256
+    MARKET_HISTORY_CACHE_MAX_BYTES: int = 64 * 1024 * 1024  # total size of cached arrays
+    MARKET_WARM_SYMBOLS: List[str] = ["BTC-USD", "ETH-USD"]
+    MARKET_WARM_DAYS: List[int] = [1, 7]
+
+    # Synthetic market (USE_MOCK_DATA): seeded GBM with jumps
+    SIM_SEED: int = 42
+    # Only these symbols get a simulated path; others use the cheap mock fallback
+    SIM_SYMBOLS: List[str] = ["BTC-USD", "ETH-USD", "SOL-USD", "DOGE-USD", "NG=F", "CL=F"]
+    SIM_TICK_SECONDS: float = 0.25
+    SIM_BAR_SECONDS: int = 3600  # history resolution
+    SIM_HISTORY_DAYS: int = 30
+    SIM_VOLATILITY: float = 0.6  # annualized
+    SIM_DRIFT: float = 0.0  # annualized
+    SIM_JUMP_INTENSITY: float = 2.0  # expected jumps per symbol per day
+    SIM_JUMP_MEAN: float = 0.0  # mean log jump size
+    SIM_JUMP_STD: float = 0.02
+    SIM_DAILY_VOLUME: float = 1_000_000.0  # average volume per symbol per day
+    SIM_VOLUME_SENSITIVITY: float = 0.5  # extra volume per standard deviation of a move
+
+    # Local tick store (append-only, memory-mapped)
+    TICK_STORE_ENABLED: bool = True
+    TICK_STORE_DIR: str = "data/ticks"
+    TICK_STORE_BAR_SECONDS: int = 60  # roll-up granularity for old ticks
+    TICK_STORE_RAW_RETENTION_SECONDS: int = 86400  # raw ticks kept before roll-up
+    TICK_STORE_MAX_GAP_SECONDS: int = 120  # larger holes force an upstream fetch
+    TICK_STORE_COMPACT_INTERVAL: float = 3600.0
+
     model_config = SettingsConfigDict(env_file=".env", case_sensitive=True)
 
 settings = Settings()
@@ -1,6 +1,7 @@
 from fastapi import Request, HTTPException
 from fastapi.responses import JSONResponse
 from starlette.status import HTTP_500_INTERNAL_SERVER_ERROR
+from app.core.logger import logger
 
 class InfrastructureError(Exception):
     """Base class for infrastructure layer errors"""
@@ -10,13 +11,18 @@ class ExternalServiceError(InfrastructureError):
     """Raised when an external API (News, AI) fails"""
     pass
 
+class ServiceOverloadedError(Exception):
+    """Raised when a concurrency limit and its wait queue are both full"""
+    def __init__(self, message: str, retry_after: int = 1):
+        super().__init__(message)
+        self.retry_after = retry_after
+
 async def global_exception_handler(request: Request, exc: Exception):
     """
     Global exception handler to ensure all errors return JSON
     and sensitive details are hidden in production.
     """
-    # In a real app, we would log the full stack trace here via structlog
-    print(f"Global Exception: {exc}")
+    logger.error(f"Global Exception: {exc}", exc_info=exc)
     
     return JSONResponse(
         status_code=HTTP_500_INTERNAL_SERVER_ERROR,
@@ -28,3 +34,11 @@ async def infrastructure_exception_handler(request: Request, exc: Infrastructure
         status_code=503,
         content={"detail": str(exc), "type": "InfrastructureError"},
     )
+
+async def overloaded_exception_handler(request: Request, exc: ServiceOverloadedError):
+    # Fast rejection: tell clients when to come back instead of queueing them
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc), "type": "ServiceOverloaded"},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
@@ -0,0 +1,203 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List
+
+from prometheus_client import Counter, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, REGISTRY
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+# --- HTTP -------------------------------------------------------------------
+
+HTTP_REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+)
+
+# --- Upstreams (CoinGecko, NewsAPI, AI) ---------------------------------------
+
+UPSTREAM_LATENCY = Histogram(
+    "upstream_request_duration_seconds",
+    "Latency of calls to external services",
+    ["upstream"],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+UPSTREAM_ERRORS = Counter(
+    "upstream_errors_total",
+    "Failed calls to external services",
+    ["upstream"],
+)
+UPSTREAM_FALLBACKS = Counter(
+    "upstream_fallbacks_total",
+    "Responses served from fallback/mock data instead of the upstream",
+    ["upstream"],
+)
+
+UPSTREAM_THROTTLED = Counter(
+    "upstream_throttled_total",
+    "Upstream requests not sent because of rate limiting (local budget or 429)",
+    ["upstream", "reason"],
+)
+
+CHAT_TIME_TO_FIRST_TOKEN = Histogram(
+    "chat_time_to_first_token_seconds",
+    "Time from accepting a streaming chat request to sending its first chunk",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+# --- Circuit breakers ---------------------------------------------------------
+
+BREAKER_STATES = {"closed": 0, "half-open": 1, "open": 2}
+BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0=closed, 1=half-open, 2=open)",
+    ["breaker"],
+)
+
+# --- WebSockets ---------------------------------------------------------------
+
+WS_CONNECTIONS = Gauge(
+    "websocket_connections",
+    "Open market WebSocket subscriptions per symbol",
+    ["symbol"],
+)
+WS_CONFLATED = Counter(
+    "websocket_conflated_ticks_total",
+    "Ticks replaced by a newer one before a slow client could receive them",
+)
+WS_SEND_LAG = Histogram(
+    "websocket_send_lag_seconds",
+    "Delay between a tick being published and sent to a client",
+    ["symbol"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+)
+
+
+def symbol_label(symbol: str) -> str:
+    """
+    Clients can subscribe to any string; only configured symbols get their
+    own series so cardinality stays bounded.
+    """
+    return symbol if symbol in settings.METRICS_SYMBOLS else "other"
+
+# --- Event loop ---------------------------------------------------------------
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop wakes a sleeping task",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0),
+)
+
+
+def set_breaker_state(breaker: str, state: str) -> None:
+    BREAKER_STATE.labels(breaker=breaker).set(BREAKER_STATES.get(state, -1))
+
+
+@contextmanager
+def track_upstream(upstream: str) -> Iterator[None]:
+    """
+    Time an upstream call and count it as an error if it raises.
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        UPSTREAM_ERRORS.labels(upstream=upstream).inc()
+        raise
+    finally:
+        UPSTREAM_LATENCY.labels(upstream=upstream).observe(time.perf_counter() - start)
+
+
+def record_fallback(upstream: str) -> None:
+    UPSTREAM_FALLBACKS.labels(upstream=upstream).inc()
+
+
+async def monitor_event_loop_lag(interval: float) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - start - interval))
+
+
+class CacheStatsCollector:
+    """
+    Exposes `stats()` of registered caches at scrape time, so the caches
+    themselves only bump plain integer counters on the hot path.
+    """
+
+    def __init__(self):
+        self._sources: Dict[str, Callable[[], dict]] = {}
+
+    def register(self, name: str, stats: Callable[[], dict]) -> None:
+        self._sources[name] = stats
+
+    def collect(self):
+        lookups = CounterMetricFamily("cache_lookups", "Cache lookups by result", labels=["cache", "result"])
+        evictions = CounterMetricFamily("cache_evictions", "Cache evictions", labels=["cache"])
+        size = GaugeMetricFamily("cache_entries", "Entries currently cached", labels=["cache"])
+        nbytes = GaugeMetricFamily("cache_bytes", "Size of cached array data", labels=["cache"])
+        for name, stats in self._sources.items():
+            s = stats()
+            lookups.add_metric([name, "hit"], s["hits"])
+            lookups.add_metric([name, "stale_hit"], s["stale_hits"])
+            lookups.add_metric([name, "miss"], s["misses"])
+            evictions.add_metric([name], s["evictions"])
+            size.add_metric([name], s["size"])
+            nbytes.add_metric([name], s.get("bytes", 0))
+        return [lookups, evictions, size, nbytes]
+
+
+cache_collector = CacheStatsCollector()
+REGISTRY.register(cache_collector)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording per-route HTTP latency.
+
+    Uses the matched route template (e.g. `/api/v1/market/history/{symbol}`)
+    as the label to keep cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status: List[int] = [500]
+
+        async def _send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            HTTP_REQUEST_LATENCY.labels(
+                method=scope["method"],
+                route=_route_template(scope),
+                status=str(status[0]),
+            ).observe(time.perf_counter() - start)
+
+
+def _route_template(scope: Scope) -> str:
+    # Unmatched paths (404s) share one label so scanners can't blow up cardinality
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    template = route.path
+    if ":path}" in template:
+        return template
+    # Newer FastAPI reports routes of included routers relative to their
+    # prefix; the prefix is then the concrete path minus the route's segments
+    prefix = scope["path"].split("/")[:-template.count("/")]
+    return "/".join(prefix) + template
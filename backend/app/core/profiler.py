@@ -0,0 +1,71 @@
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Optional
+
+
+class SamplingProfiler:
+    """
+    Low-overhead sampling profiler that can be switched on at runtime.
+
+    A daemon thread snapshots the target thread's Python stack every
+    `interval` seconds and counts identical stacks. Results are returned in
+    collapsed-stack format ("frame;frame;frame count"), ready for
+    flamegraph tools. Nothing runs while it is stopped.
+    """
+
+    def __init__(self):
+        self._samples: Counter = Counter()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.started_at: Optional[float] = None
+        self.sample_count = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval: float, target_thread_id: Optional[int] = None) -> None:
+        if self.running:
+            return
+        target = target_thread_id or threading.get_ident()
+        with self._lock:
+            self._samples.clear()
+            self.sample_count = 0
+        self._stop.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(
+            target=self._run, args=(target, interval), name="sampling-profiler", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> str:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        return self.collapsed()
+
+    def collapsed(self) -> str:
+        with self._lock:
+            lines = [f"{stack} {count}" for stack, count in self._samples.most_common()]
+        return "\n".join(lines)
+
+    def _run(self, target: int, interval: float) -> None:
+        while not self._stop.wait(interval):
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})")
+                frame = frame.f_back
+            with self._lock:
+                self._samples[";".join(reversed(stack))] += 1
+                self.sample_count += 1
+
+
+profiler = SamplingProfiler()
@@ -1,20 +1,36 @@
-from typing import Protocol, List
-from app.domain.models import NewsItem, MarketTicker
+from typing import Protocol, List, Dict, Optional, AsyncIterator
+from datetime import datetime
+from app.domain.models import NewsItem, MarketTicker, PriceHistory
 
 class NewsClient(Protocol):
     async def fetch_latest_news(self, limit: int = 10) -> List[NewsItem]:
         ...
 
+    async def fetch_since(self, since: Optional[datetime], page_size: int, page: int = 1) -> List[NewsItem]:
+        ...
+
 class AIService(Protocol):
     async def analyze_sentiment(self, text: str) -> float:
         ...
+
+    async def analyze_sentiment_batch(self, texts: List[str]) -> List[float]:
+        ...
     
     async def summarize_text(self, text: str) -> str:
         ...
 
+    def stream_chat(self, message: str) -> AsyncIterator[str]:
+        ...
+
 class MarketDataProvider(Protocol):
     async def get_latest_price(self, symbol: str) -> float:
         ...
 
-    async def get_price_history(self, symbol: str, days: int) -> List[MarketTicker]:
+    async def get_latest_prices(self, symbols: List[str]) -> Dict[str, float]:
+        ...
+
+    async def generate_ticker(self, symbol: str) -> MarketTicker:
+        ...
+
+    async def get_price_history(self, symbol: str, days: int) -> PriceHistory:
         ...
@@ -1,6 +1,10 @@
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
+
+import numpy as np
+
+from app.domain.downsampling import lttb_indices
 
 @dataclass
 class NewsItem:
@@ -20,3 +24,46 @@ class MarketTicker:
     timestamp: datetime
     change_24h: float
     volume: float
+
+@dataclass
+class PriceHistory:
+    """
+    Columnar price history: one NumPy array per field instead of one
+    MarketTicker object per point.
+    """
+    symbol: str
+    timestamps: np.ndarray  # int64, epoch milliseconds (UTC)
+    prices: np.ndarray      # float64
+    volumes: np.ndarray     # float64
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @property
+    def nbytes(self) -> int:
+        return self.timestamps.nbytes + self.prices.nbytes + self.volumes.nbytes
+
+    def downsample(self, max_points: int) -> "PriceHistory":
+        if len(self) <= max_points:
+            return self
+        idx = lttb_indices(self.timestamps, self.prices, max_points)
+        return PriceHistory(
+            symbol=self.symbol,
+            timestamps=self.timestamps[idx],
+            prices=self.prices[idx],
+            volumes=self.volumes[idx],
+        )
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        # Vectorized timestamp formatting; tolist() yields native floats for JSON
+        timestamps = np.datetime_as_string(self.timestamps.astype("datetime64[ms]"), unit="ms").tolist()
+        return [
+            {
+                "symbol": self.symbol,
+                "price": price,
+                "timestamp": ts,
+                "change_24h": 0.0, # Not provided in history
+                "volume": volume,
+            }
+            for ts, price, volume in zip(timestamps, self.prices.tolist(), self.volumes.tolist())
+        ]
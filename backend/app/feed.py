@@ -0,0 +1,80 @@
+"""
+Standalone price feed process for multi-worker deployments.
+
+    python -m app.feed
+    MARKET_FEED_MODE=remote MARKET_FEED_WORKERS=4 uvicorn app.main:app --workers 4
+
+The feed is the only process that polls upstream, keeps the mock random
+walk and writes the tick store. Web workers subscribe to symbols over the
+Unix socket at MARKET_FEED_SOCKET and only handle client I/O, so every
+worker streams the same prices and upstream load doesn't grow with the
+number of workers.
+"""
+import asyncio
+import signal
+
+from prometheus_client import start_http_server
+
+from app.core.config import settings
+from app.core.logger import setup_logging, logger
+from app.infrastructure.cache import AsyncTTLCache
+from app.infrastructure.external.market_client import MarketDataProviderImpl
+from app.infrastructure.http import HttpClientPool, COINGECKO_BASE_URL
+from app.infrastructure.price_feed import FeedServer
+from app.infrastructure.price_hub import PriceHub
+from app.infrastructure.resilience import TokenBucket
+from app.infrastructure.tick_store import TickStore, compact_periodically
+
+
+async def run_feed() -> None:
+    http_pool = HttpClientPool()
+    http_pool.client(COINGECKO_BASE_URL)
+    # Unused for ticks, but the provider requires one
+    history_cache = AsyncTTLCache(max_entries=1, stale_ttl=0, name="feed_history")
+
+    tick_store = None
+    compact_task = None
+    if settings.TICK_STORE_ENABLED:
+        tick_store = TickStore(
+            settings.TICK_STORE_DIR,
+            bar_seconds=settings.TICK_STORE_BAR_SECONDS,
+            raw_retention_seconds=settings.TICK_STORE_RAW_RETENTION_SECONDS
+        )
+        compact_task = asyncio.create_task(
+            compact_periodically(tick_store, settings.TICK_STORE_COMPACT_INTERVAL)
+        )
+
+    # The web workers spend MARKET_FEED_WORKER_BUDGET of the CoinGecko budget
+    limiter = TokenBucket(
+        "coingecko",
+        rate_per_minute=settings.COINGECKO_RATE_PER_MINUTE * (1 - settings.MARKET_FEED_WORKER_BUDGET),
+        burst=settings.COINGECKO_BURST
+    )
+    hub = PriceHub(MarketDataProviderImpl(http_pool, history_cache, tick_store, limiter=limiter))
+    server = FeedServer(hub, settings.MARKET_FEED_SOCKET)
+    await server.start()
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    await stop.wait()
+
+    logger.info("Shutting down price feed")
+    if compact_task is not None:
+        compact_task.cancel()
+    await server.close()
+    await hub.close()
+    await history_cache.close()
+    await http_pool.aclose()
+
+
+def main() -> None:
+    setup_logging()
+    if settings.MARKET_FEED_METRICS_PORT:
+        start_http_server(settings.MARKET_FEED_METRICS_PORT)
+    asyncio.run(run_feed())
+
+
+if __name__ == "__main__":
+    main()
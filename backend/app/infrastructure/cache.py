@@ -0,0 +1,141 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from app.core.logger import logger
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    nbytes: int = 0
+
+
+class AsyncTTLCache:
+    """
+    Bounded in-process cache with per-entry TTL and stale-while-revalidate.
+
+    - Fresh entries are served from memory.
+    - Expired entries still inside the `stale_ttl` grace window are served
+      immediately while a single background refresh reloads them.
+    - Concurrent misses for the same key share one load.
+    - Least recently used entries are evicted beyond `max_entries`, or
+      beyond `max_bytes` in total for values that report an `nbytes` size
+      (entries differ widely: a year of history dwarfs a day of it).
+    """
+
+    def __init__(self, max_entries: int, stale_ttl: float, name: str = "cache",
+                 max_bytes: Optional[int] = None):
+        self.name = name
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._bytes = 0
+        self._stale_ttl = stale_ttl
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._loading: Dict[Hashable, asyncio.Task] = {}
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+    ) -> Any:
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if now < entry.expires_at:
+                self.hits += 1
+                return entry.value
+            if now < entry.expires_at + self._stale_ttl:
+                self.stale_hits += 1
+                self._schedule_refresh(key, loader, ttl)
+                return entry.value
+
+        self.misses += 1
+        return await self._load(key, loader, ttl)
+
+    def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        nbytes = getattr(value, "nbytes", 0)
+        self._entries[key] = _Entry(value=value, expires_at=time.monotonic() + ttl, nbytes=nbytes)
+        self._bytes += nbytes
+        # The newest entry always stays, even if it alone exceeds max_bytes
+        while len(self._entries) > 1 and (
+            len(self._entries) > self._max_entries
+            or (self._max_bytes is not None and self._bytes > self._max_bytes)
+        ):
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "max_entries": self._max_entries,
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
+
+    async def close(self) -> None:
+        tasks = list(self._refreshing.values()) + list(self._loading.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._refreshing.clear()
+
+    async def _load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        # Single-flight: concurrent misses wait on the same load. It runs in
+        # its own task, so a cancelled caller never cancels it for the others
+        task = self._loading.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_load(key, loader, ttl))
+            task.add_done_callback(_mark_retrieved)
+            self._loading[key] = task
+        return await asyncio.shield(task)
+
+    async def _run_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        try:
+            value = await loader()
+            self.set(key, value, ttl)
+            return value
+        finally:
+            del self._loading[key]
+
+    def _schedule_refresh(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float) -> None:
+        if key in self._refreshing or key in self._loading:
+            return
+
+        async def _refresh():
+            try:
+                await self._load(key, loader, ttl)
+            except Exception as e:
+                # Keep serving the stale value; the next lookup retries
+                logger.warning(f"{self.name} refresh failed for {key}: {e}")
+            finally:
+                self._refreshing.pop(key, None)
+
+        self._refreshing[key] = asyncio.create_task(_refresh())
+
+
+def _mark_retrieved(task: asyncio.Task) -> None:
+    # Loads nobody waits for any more must not warn about unretrieved errors
+    if not task.cancelled():
+        task.exception()
@@ -1,68 +1,238 @@
 import random
 import asyncio
-import httpx
-from typing import Dict, List
-from datetime import datetime
+from typing import Dict, List, Optional, Set
+from datetime import datetime, timezone
+import numpy as np
 from app.domain.interfaces import MarketDataProvider
-import pybreaker
-from app.domain.models import MarketTicker
+from app.domain.models import MarketTicker, PriceHistory
 from app.core.config import settings
-from app.infrastructure.resilience import market_breaker
+from app.infrastructure.resilience import (
+    AsyncCircuitBreaker, TokenBucket, CircuitBreakerError, RateLimitedError,
+    market_breaker, coingecko_limiter, guarded_call
+)
+from app.infrastructure.http import HttpClientPool, COINGECKO_BASE_URL
+from app.infrastructure.cache import AsyncTTLCache
+from app.infrastructure.tick_store import TickStore
+from app.infrastructure.simulator import MarketSimulator
+from app.core.logger import logger
+from app.core.metrics import track_upstream, record_fallback
 
-class MarketDataProviderImpl(MarketDataProvider):
-    def __init__(self):
-        self._tickers: Dict[str, float] = {
-            "BTC-USD": 45000.00,
-            "ETH-USD": 2800.00,
-            "NG=F": 2.50, # Natural Gas
-            "CL=F": 75.00 # Crude Oil
-        }
+# Map common symbols to CoinGecko IDs
+SYMBOL_MAP = {
+    "BTC-USD": "bitcoin",
+    "ETH-USD": "ethereum",
+    "SOL-USD": "solana",
+    "DOGE-USD": "dogecoin",
+}
 
-    async def get_latest_price(self, symbol: str) -> float:
-        if settings.USE_MOCK_DATA:
-            return self._get_mock_price(symbol)
+# Starting points for mock prices (fallbacks and the USE_MOCK_DATA simulator)
+DEFAULT_PRICES = {
+    "BTC-USD": 45000.00,
+    "ETH-USD": 2800.00,
+    "NG=F": 2.50, # Natural Gas
+    "CL=F": 75.00 # Crude Oil
+}
+
+class CoinGeckoPriceBatcher:
+    """
+    Coalesces `/simple/price` lookups.
+
+    Concurrent callers for the same coin share one in-flight future
+    (single-flight), and lookups for different coins that arrive within
+    `window` seconds are merged into a single `ids=a,b,c` request.
+    """
+
+    def __init__(self, http: HttpClientPool, window: float = settings.MARKET_BATCH_WINDOW,
+                 max_batch: int = settings.MARKET_BATCH_MAX_IDS,
+                 breaker: AsyncCircuitBreaker = market_breaker,
+                 limiter: TokenBucket = coingecko_limiter):
+        self._http = http
+        self._breaker = breaker
+        self._limiter = limiter
+        self._window = window
+        self._max_batch = max_batch
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # The loop only keeps weak references to tasks
+        self._fetches: Set[asyncio.Task] = set()
+        self.upstream_calls = 0
 
-        # Map common symbols to CoinGecko IDs
-        symbol_map = {
-            "BTC-USD": "bitcoin",
-            "ETH-USD": "ethereum",
-            "SOL-USD": "solana",
-            "DOGE-USD": "dogecoin",
+    async def get(self, coin_id: str) -> Optional[float]:
+        return await asyncio.shield(self._future_for(coin_id))
+
+    async def get_many(self, coin_ids: List[str]) -> Dict[str, Optional[float]]:
+        futures = {coin_id: self._future_for(coin_id) for coin_id in set(coin_ids)}
+        results = await asyncio.gather(
+            *(asyncio.shield(f) for f in futures.values()), return_exceptions=True
+        )
+        return {
+            coin_id: None if isinstance(result, BaseException) else result
+            for coin_id, result in zip(futures, results)
         }
-        
-        coin_id = symbol_map.get(symbol)
-        if not coin_id:
-            # Fallback to mock for unknown symbols in MVP
-            return self._get_mock_price(symbol)
 
+    def _future_for(self, coin_id: str) -> asyncio.Future:
+        # Single-flight: join a lookup that is already queued or on the wire
+        future = self._in_flight.get(coin_id) or self._pending.get(coin_id)
+        if future is not None:
+            return future
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[coin_id] = future
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        self._in_flight.update(batch)
+        task = asyncio.create_task(self._fetch_batch(batch))
+        self._fetches.add(task)
+        task.add_done_callback(self._fetches.discard)
+
+    async def _fetch_batch(self, batch: Dict[str, asyncio.Future]) -> None:
         try:
-            # Circuit Breaker wraps the external call
             async def _fetch():
-                async with httpx.AsyncClient() as client:
+                self.upstream_calls += 1
+                client = self._http.client(COINGECKO_BASE_URL)
+                with track_upstream("coingecko"):
                     response = await client.get(
-                        f"https://api.coingecko.com/api/v3/simple/price?ids={coin_id}&vs_currencies=usd",
-                        timeout=5.0
+                        "/simple/price",
+                        params={"ids": ",".join(sorted(batch)), "vs_currencies": "usd"}
                     )
                     response.raise_for_status()
-                    return response
+                return response
 
-            # If Circuit is OPEN, this raises CircuitBreakerError immediately
-            response = await market_breaker.call(_fetch)
-            
+            # If Circuit is OPEN or we're out of request budget, this raises immediately
+            response = await guarded_call(self._breaker, self._limiter, _fetch)
             data = response.json()
-            price = data.get(coin_id, {}).get("usd")
+            for coin_id, future in batch.items():
+                price = data.get(coin_id, {}).get("usd")
+                if not future.done():
+                    future.set_result(float(price) if price else None)
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            for coin_id, future in batch.items():
+                if self._in_flight.get(coin_id) is future:
+                    del self._in_flight[coin_id]
+            # Nobody may be awaiting a failed future any more; mark it retrieved
+            for future in batch.values():
+                if future.done() and not future.cancelled():
+                    future.exception()
+
+
+def history_ttl(days: int) -> float:
+    """
+    Short ranges move quickly; long ranges barely change between requests.
+    """
+    if days <= 1:
+        return settings.MARKET_HISTORY_TTL_INTRADAY
+    if days <= 30:
+        return settings.MARKET_HISTORY_TTL_MONTH
+    return settings.MARKET_HISTORY_TTL_LONG
+
+
+class MarketDataProviderImpl(MarketDataProvider):
+    def __init__(self, http: HttpClientPool, history_cache: AsyncTTLCache,
+                 tick_store: Optional[TickStore] = None,
+                 breaker: AsyncCircuitBreaker = market_breaker,
+                 limiter: TokenBucket = coingecko_limiter,
+                 simulator: Optional[MarketSimulator] = None):
+        self._http = http
+        self._history_cache = history_cache
+        self._tick_store = tick_store
+        self._breaker = breaker
+        self._limiter = limiter
+        self._prices = CoinGeckoPriceBatcher(http, breaker=breaker, limiter=limiter)
+        self._tickers: Dict[str, float] = dict(DEFAULT_PRICES)
+        self._simulator = simulator
+
+    @property
+    def simulator(self) -> MarketSimulator:
+        # Built on first use so real-data deployments never allocate it
+        if self._simulator is None:
+            self._simulator = MarketSimulator(initial_prices=DEFAULT_PRICES,
+                                              universe=settings.SIM_SYMBOLS)
+        return self._simulator
+
+    async def get_latest_price(self, symbol: str) -> float:
+        if settings.USE_MOCK_DATA:
+            if symbol in self.simulator:
+                return self.simulator.price(symbol)
+            return self._get_mock_price(symbol)
+
+        coin_id = SYMBOL_MAP.get(symbol)
+        if not coin_id:
+            # Fallback to mock for unknown symbols in MVP
+            return self._get_mock_price(symbol)
+
+        try:
+            price = await self._prices.get(coin_id)
             if price:
-                return float(price)
+                self._record_tick(symbol, price)
+                return price
 
-        except pybreaker.CircuitBreakerError:
-            print(f"Circuit OPEN for Market Data. Using Fallback.")
+        except CircuitBreakerError:
+            logger.warning("Circuit OPEN for Market Data. Using Fallback.")
             # Fallthrough to mock
+        except RateLimitedError:
+            # Out of CoinGecko budget: don't spend a request that would be rejected
+            logger.info(f"CoinGecko rate limited, using fallback for {symbol}.")
         except Exception as e:
             # Fallback to mock on error (Resilience)
-            print(f"CoinGecko Error: {e}, using fallback.")
+            logger.error(f"CoinGecko Error: {e}, using fallback.")
             
+        record_fallback("coingecko")
         return self._get_mock_price(symbol)
 
+    async def get_latest_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Resolve many symbols with a single batched upstream round trip.
+        """
+        if settings.USE_MOCK_DATA:
+            simulated = self.simulator.prices([s for s in symbols if s in self.simulator])
+            return {s: simulated[s] if s in simulated else self._get_mock_price(s) for s in symbols}
+
+        coin_ids = [SYMBOL_MAP[s] for s in symbols if s in SYMBOL_MAP]
+        prices = await self._prices.get_many(coin_ids) if coin_ids else {}
+
+        results = {}
+        for symbol in symbols:
+            price = prices.get(SYMBOL_MAP.get(symbol))
+            if price:
+                self._record_tick(symbol, price)
+                results[symbol] = price
+            else:
+                # Unknown symbols and failed lookups fall back to mock (Resilience)
+                if symbol in SYMBOL_MAP:
+                    record_fallback("coingecko")
+                results[symbol] = self._get_mock_price(symbol)
+        return results
+
+    def _record_tick(self, symbol: str, price: float) -> None:
+        # Fallbacks (breaker open, rate limited) continue from the last real price
+        self._tickers[symbol] = price
+        # Only real upstream prices are persisted; mock fallbacks never are
+        if self._tick_store is None:
+            return
+        try:
+            now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+            self._tick_store.append(symbol, now_ms, price)
+        except OSError as e:
+            logger.error(f"Tick store append failed for {symbol}: {e}")
+
     def _get_mock_price(self, symbol: str) -> float:
         current = self._tickers.get(symbol, 1000.0)
         change = random.uniform(-0.005, 0.005) * current
@@ -71,6 +241,10 @@ class MarketDataProviderImpl(MarketDataProvider):
         return new_price
 
     async def generate_ticker(self, symbol: str) -> MarketTicker:
+        if settings.USE_MOCK_DATA and symbol in self.simulator:
+            # Price, 24h change and volume all come from the same simulated path
+            return self.simulator.ticker(symbol)
+
         price = await self.get_latest_price(symbol)
         return MarketTicker(
             symbol=symbol,
@@ -80,67 +254,89 @@ class MarketDataProviderImpl(MarketDataProvider):
             volume=round(random.uniform(1000, 50000), 2)
         )
 
-    async def get_price_history(self, symbol: str, days: int) -> List[MarketTicker]:
+    async def get_price_history(self, symbol: str, days: int) -> PriceHistory:
         if settings.USE_MOCK_DATA:
+            if symbol in self.simulator:
+                return self.simulator.history(symbol, days)
             return self._get_mock_history(symbol, days)
 
-        symbol_map = {
-            "BTC-USD": "bitcoin",
-            "ETH-USD": "ethereum",
-            "SOL-USD": "solana",
-            "DOGE-USD": "dogecoin",
-        }
-        coin_id = symbol_map.get(symbol)
+        coin_id = SYMBOL_MAP.get(symbol)
         
         if not coin_id:
              return self._get_mock_history(symbol, days)
 
-        try:
-             async def _fetch():
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"https://api.coingecko.com/api/v3/coins/{coin_id}/market_chart?vs_currency=usd&days={days}",
-                        timeout=10.0
-                    )
-                    response.raise_for_status()
-                    return response
-
-             response = await market_breaker.call(_fetch)
-             data = response.json()
-             prices = data.get("prices", [])
-             
-             history = []
-             for p in prices:
-                 # CoinGecko returns [timestamp_ms, price]
-                 ts = datetime.fromtimestamp(p[0] / 1000)
-                 history.append(MarketTicker(
-                     symbol=symbol,
-                     price=float(p[1]),
-                     timestamp=ts,
-                     change_24h=0.0, # Not provided in history
-                     volume=0.0
-                 ))
-             return history
+        # Ranges we have recorded ourselves are served from disk
+        if self._tick_store is not None:
+            end_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+            local = self._tick_store.history(
+                symbol,
+                end_ms - days * 86_400_000,
+                end_ms,
+                max_gap_ms=settings.TICK_STORE_MAX_GAP_SECONDS * 1000
+            )
+            if local is not None:
+                return local
 
+        try:
+            # Fresh or stale-while-revalidate hits never touch the network
+            return await self._history_cache.get(
+                (symbol, days),
+                lambda: self._fetch_price_history(symbol, coin_id, days),
+                ttl=history_ttl(days)
+            )
         except Exception as e:
-            print(f"History Fetch Error: {e}")
+            logger.error(f"History Fetch Error: {e}")
+            record_fallback("coingecko")
             return self._get_mock_history(symbol, days)
 
-    def _get_mock_history(self, symbol: str, days: int) -> List[MarketTicker]:
-        history = []
+    async def _fetch_price_history(self, symbol: str, coin_id: str, days: int) -> PriceHistory:
+        async def _fetch():
+            client = self._http.client(COINGECKO_BASE_URL)
+            with track_upstream("coingecko"):
+                response = await client.get(
+                    f"/coins/{coin_id}/market_chart",
+                    params={"vs_currency": "usd", "days": days}
+                )
+                response.raise_for_status()
+            return response
+
+        response = await guarded_call(self._breaker, self._limiter, _fetch)
+        data = response.json()
+        # CoinGecko returns [[timestamp_ms, value], ...] per series
+        prices = np.asarray(data.get("prices", []), dtype=np.float64).reshape(-1, 2)
+        volumes = np.asarray(data.get("total_volumes", []), dtype=np.float64).reshape(-1, 2)
+        if len(volumes) != len(prices):
+            volumes = np.zeros_like(prices)
+
+        return PriceHistory(
+            symbol=symbol,
+            timestamps=prices[:, 0].astype(np.int64),
+            prices=prices[:, 1],
+            volumes=volumes[:, 1]
+        )
+
+    async def warm_history(self, symbols: List[str], ranges: List[int]) -> None:
+        """
+        Pre-load popular (symbol, days) pairs so first requests hit memory.
+        """
+        if settings.USE_MOCK_DATA:
+            return
+
+        for symbol in symbols:
+            for days in ranges:
+                await self.get_price_history(symbol, days)
+
+    def _get_mock_history(self, symbol: str, days: int) -> PriceHistory:
         base_price = self._tickers.get(symbol, 1000.0)
-        now = datetime.utcnow()
-        points = 24 if days == 1 else days # 1 point per hour for 1 day, or 1 point per day
-        
-        from datetime import timedelta
-        for i in range(points):
-            t = now - timedelta(hours=(points - i) if days == 1 else (points - i) * 24)
-            price = base_price * (1 + random.uniform(-0.1, 0.1))
-            history.append(MarketTicker(
-                symbol=symbol,
-                price=round(price, 2),
-                timestamp=t,
-                change_24h=0.0,
-                volume=0.0
-            ))
-        return history
+        now_ms = int(datetime.utcnow().replace(tzinfo=timezone.utc).timestamp() * 1000)
+        points = 24 if days == 1 else max(days, 0) # 1 point per hour for 1 day, or 1 point per day
+        step_ms = 3_600_000 if days == 1 else 86_400_000
+
+        timestamps = now_ms - np.arange(points, 0, -1, dtype=np.int64) * step_ms
+        prices = np.round(base_price * (1 + np.random.uniform(-0.1, 0.1, points)), 2)
+        return PriceHistory(
+            symbol=symbol,
+            timestamps=timestamps,
+            prices=prices,
+            volumes=np.zeros(points)
+        )
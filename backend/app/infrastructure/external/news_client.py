@@ -1,17 +1,21 @@
-import httpx
-from typing import List
-from datetime import datetime
-from tenacity import retry, stop_after_attempt, wait_exponential
+import hashlib
+from typing import List, Optional
+from datetime import datetime, timezone
 
 from app.domain.interfaces import NewsClient
 from app.domain.models import NewsItem
 from app.core.config import settings
 from app.core.logger import logger
-from app.infrastructure.resilience import news_breaker
-import pybreaker
+from app.core.metrics import track_upstream, record_fallback
+from app.infrastructure.resilience import (
+    TokenBucket, news_breaker, newsapi_limiter, guarded_call, CircuitBreakerError
+)
+from app.infrastructure.http import HttpClientPool, NEWSAPI_BASE_URL
 
 class NewsClientImpl(NewsClient):
-    def __init__(self):
+    def __init__(self, http: HttpClientPool, limiter: TokenBucket = newsapi_limiter):
+        self._http = http
+        self._limiter = limiter
         self.mock_news = [
             NewsItem(
                 id="1",
@@ -35,47 +39,86 @@ class NewsClientImpl(NewsClient):
             )
         ]
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=4, max=10),
-        reraise=False # Don't crash app, return empty/mock
-    )
     async def fetch_latest_news(self, limit: int = 10) -> List[NewsItem]:
         if settings.USE_MOCK_DATA or not settings.NEWS_API_KEY:
             logger.info("Fetching mock news data (Mock Mode or No Key)")
             return self.mock_news
 
         try:
-            # Circuit Breaker wraps the external call
-            async def _fetch():
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"https://newsapi.org/v2/everything?q=crypto&sortBy=publishedAt&language=en&pageSize={limit}&apiKey={settings.NEWS_API_KEY}",
-                        timeout=5.0
-                    )
-                    response.raise_for_status()
-                    return response
-
-            response = await news_breaker.call(_fetch)
-            data = response.json()
-            
-            start_id = int(datetime.utcnow().timestamp())
-            return [
-                NewsItem(
-                    id=str(start_id + i),
-                    title=article.get('title'),
-                    url=article.get('url'),
-                    source=article.get('source', {}).get('name', 'Unknown'),
-                    published_at=datetime.utcnow(), # Simplify for MVP
-                    summary=article.get('description') or "No summary available.",
-                    sentiment_score=0.0, # Placeholder awaiting AI
-                    sentiment_label="Neutral"
-                ) for i, article in enumerate(data.get('articles', []))
-            ]
+            return await self._fetch_articles(page_size=limit)
             
-        except pybreaker.CircuitBreakerError:
+        except CircuitBreakerError:
             logger.warning("Circuit OPEN for News API. Using Fallback.")
+            record_fallback("newsapi")
             return self.mock_news
         except Exception as e:
             logger.error(f"Failed to fetch news: {e}")
+            record_fallback("newsapi")
             return self.mock_news # Fallback to mock logic
+
+    async def fetch_since(self, since: Optional[datetime], page_size: int, page: int = 1) -> List[NewsItem]:
+        """
+        Articles published at or after `since` (all recent ones if None),
+        newest first, one `page` (1-based) at a time.
+        Errors propagate so the caller can decide when to retry.
+        """
+        if settings.USE_MOCK_DATA or not settings.NEWS_API_KEY:
+            return self.mock_news if page == 1 else []
+
+        return await self._fetch_articles(page_size=page_size, since=since, page=page)
+
+    async def _fetch_articles(self, page_size: int, since: Optional[datetime] = None,
+                              page: int = 1) -> List[NewsItem]:
+        params = {
+            "q": settings.NEWS_QUERY,
+            "sortBy": "publishedAt",
+            "language": "en",
+            "pageSize": page_size,
+            "page": page,
+            "apiKey": settings.NEWS_API_KEY,
+        }
+        if since is not None:
+            params["from"] = since.strftime("%Y-%m-%dT%H:%M:%S")
+
+        # Circuit Breaker wraps the external call
+        async def _fetch():
+            client = self._http.client(NEWSAPI_BASE_URL)
+            with track_upstream("newsapi"):
+                response = await client.get("/everything", params=params)
+                response.raise_for_status()
+            return response
+
+        response = await guarded_call(news_breaker, self._limiter, _fetch)
+        data = response.json()
+        return [
+            self._to_news_item(article)
+            for article in data.get('articles', [])
+            if article.get('url') and article.get('title')
+        ]
+
+    @staticmethod
+    def _to_news_item(article: dict) -> NewsItem:
+        return NewsItem(
+            # Stable across polls: the same article always maps to the same id
+            id=hashlib.sha1(article['url'].encode("utf-8")).hexdigest()[:16],
+            title=article['title'],
+            url=article['url'],
+            source=(article.get('source') or {}).get('name') or 'Unknown',
+            published_at=_parse_published_at(article.get('publishedAt')),
+            summary=article.get('description') or "No summary available.",
+            sentiment_score=0.0, # Placeholder awaiting AI
+            sentiment_label="Neutral"
+        )
+
+
+def _parse_published_at(value: Optional[str]) -> datetime:
+    # NewsAPI sends ISO 8601 UTC ("2024-05-01T12:30:00Z"); keep naive UTC like the rest of the app
+    if not value:
+        return datetime.utcnow()
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return datetime.utcnow()
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
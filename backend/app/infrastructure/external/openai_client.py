@@ -1,20 +1,49 @@
 from app.domain.interfaces import AIService
 from app.core.config import settings
 from app.core.logger import logger
+from app.core.metrics import track_upstream
+import asyncio
 import random
+from typing import AsyncIterator, List
 
 class AIServiceImpl(AIService):
     async def analyze_sentiment(self, text: str) -> float:
-        if settings.USE_MOCK_DATA or not settings.OPENAI_API_KEY:
-            logger.info("Using Mock AI Sentiment")
-            # Simulate processing time or random sentiment
-            return round(random.uniform(-1.0, 1.0), 2)
-        
-        # Real OpenAI Call would go here
-        return 0.0
+        with track_upstream("openai"):
+            if settings.USE_MOCK_DATA or not settings.OPENAI_API_KEY:
+                logger.info("Using Mock AI Sentiment")
+                # Simulate processing time or random sentiment
+                return round(random.uniform(-1.0, 1.0), 2)
+            
+            # Real OpenAI Call would go here
+            return 0.0
+
+    async def analyze_sentiment_batch(self, texts: List[str]) -> List[float]:
+        with track_upstream("openai"):
+            if settings.USE_MOCK_DATA or not settings.OPENAI_API_KEY:
+                logger.info(f"Using Mock AI Sentiment for batch of {len(texts)}")
+                return [round(random.uniform(-1.0, 1.0), 2) for _ in texts]
+
+            # Real OpenAI Call would go here: one prompt scoring all texts at once
+            return [0.0 for _ in texts]
 
     async def summarize_text(self, text: str) -> str:
+        with track_upstream("openai"):
+            if settings.USE_MOCK_DATA or not settings.OPENAI_API_KEY:
+                return "This is an AI generated summary of the news article (Mock Mode)."
+            
+            return "Real summary pending implementation."
+
+    async def stream_chat(self, message: str) -> AsyncIterator[str]:
         if settings.USE_MOCK_DATA or not settings.OPENAI_API_KEY:
-            return "This is an AI generated summary of the news article (Mock Mode)."
-        
-        return "Real summary pending implementation."
+            reply = (
+                "This is a streamed AI response (Mock Mode). "
+                "Real answers will arrive token by token once the model is connected."
+            )
+            for word in reply.split(" "):
+                # Simulate token latency
+                await asyncio.sleep(0.02)
+                yield word + " "
+            return
+
+        # Real OpenAI streaming call (stream=True) would go here
+        yield "Real chat pending implementation."
@@ -0,0 +1,58 @@
+import httpx
+from typing import Dict
+from app.core.config import settings
+from app.core.logger import logger
+
+try:
+    import h2  # noqa: F401  (required by httpx for HTTP/2)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Upstream hosts used by the external adapters
+COINGECKO_BASE_URL = settings.COINGECKO_BASE_URL
+NEWSAPI_BASE_URL = settings.NEWSAPI_BASE_URL
+
+
+class HttpClientPool:
+    """
+    App-lifetime registry of pooled httpx clients, one per upstream host.
+    Keeps TCP/TLS connections alive across requests instead of
+    handshaking on every upstream call.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def client(self, base_url: str) -> httpx.AsyncClient:
+        client = self._clients.get(base_url)
+        if client is None or client.is_closed:
+            client = self._create_client(base_url)
+            self._clients[base_url] = client
+        return client
+
+    def _create_client(self, base_url: str) -> httpx.AsyncClient:
+        http2 = settings.HTTP2_ENABLED and HTTP2_AVAILABLE
+        if settings.HTTP2_ENABLED and not HTTP2_AVAILABLE:
+            logger.warning("HTTP/2 requested but 'h2' is not installed. Using HTTP/1.1.")
+
+        return httpx.AsyncClient(
+            base_url=base_url,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                settings.HTTP_READ_TIMEOUT,
+                connect=settings.HTTP_CONNECT_TIMEOUT,
+                pool=settings.HTTP_POOL_TIMEOUT,
+            ),
+        )
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
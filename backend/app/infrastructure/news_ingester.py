@@ -0,0 +1,123 @@
+import asyncio
+from collections import deque
+from datetime import datetime
+from itertools import islice
+from typing import Deque, Dict, List, Optional
+
+from app.core.logger import logger
+from app.domain.interfaces import NewsClient
+from app.domain.models import NewsItem
+from app.infrastructure.sentiment import SentimentEnricher, content_hash
+
+
+class NewsIngester:
+    """
+    Polls the news source in the background, outside any user request.
+
+    Each poll only asks for articles newer than the newest `published_at`
+    seen so far, paging back (up to `max_pages`) until it reaches articles
+    it already has, so a burst larger than one page isn't lost. Articles are de-duplicated by id (derived from the URL)
+    and by content hash, scored once, and kept in a bounded newest-first
+    ring that `/news/` reads in O(limit).
+    """
+
+    def __init__(self, news_client: NewsClient, enricher: Optional[SentimentEnricher],
+                 capacity: int, page_size: int, interval: float, max_pages: int = 5):
+        self._client = news_client
+        self._enricher = enricher
+        self._capacity = capacity
+        self._page_size = page_size
+        self._max_pages = max_pages
+        self._interval = interval
+        self._ring: Deque[NewsItem] = deque()
+        self._by_id: Dict[str, NewsItem] = {}
+        self._content_keys: Dict[str, str] = {}  # content hash -> id
+        self._key_by_id: Dict[str, str] = {}  # id -> content hash
+        self._newest: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def latest(self, limit: int) -> List[NewsItem]:
+        return list(islice(self._ring, limit))
+
+    def get(self, news_id: str) -> Optional[NewsItem]:
+        return self._by_id.get(news_id)
+
+    def __len__(self) -> int:
+        return len(self._ring)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def poll_once(self) -> int:
+        """
+        Fetch, de-duplicate, enrich and store new articles.
+        Returns the number of articles added.
+        """
+        fetched = await self._fetch_new()
+        fresh = []
+        seen = set()
+        for item in fetched:
+            key = content_hash(f"{item.title}\n{item.summary or ''}")
+            if item.id in self._by_id or key in self._content_keys or key in seen:
+                continue
+            seen.add(key)
+            fresh.append((key, item))
+        if not fresh:
+            return 0
+
+        items = [item for _, item in fresh]
+        if self._enricher is not None:
+            items = await self._enricher.enrich(items)
+
+        # Oldest first so the newest article ends up at the front of the ring
+        for (key, _), item in sorted(zip(fresh, items), key=lambda pair: pair[1].published_at):
+            self._insert(key, item)
+            if self._newest is None or item.published_at > self._newest:
+                self._newest = item.published_at
+        return len(items)
+
+    async def _fetch_new(self) -> List[NewsItem]:
+        fetched: List[NewsItem] = []
+        ids = set()
+        for page in range(1, self._max_pages + 1):
+            batch = await self._client.fetch_since(self._newest, self._page_size, page)
+            overlaps = any(item.id in self._by_id or item.id in ids for item in batch)
+            fetched.extend(batch)
+            ids.update(item.id for item in batch)
+            # First poll takes one page; later ones page back to what we already have
+            if self._newest is None or overlaps or len(batch) < self._page_size:
+                return fetched
+        logger.warning(
+            f"More than {self._max_pages} pages of new articles since {self._newest}; older ones were skipped"
+        )
+        return fetched
+
+    def _insert(self, key: str, item: NewsItem) -> None:
+        if len(self._ring) >= self._capacity:
+            evicted = self._ring.pop()
+            self._by_id.pop(evicted.id, None)
+            self._content_keys.pop(self._key_by_id.pop(evicted.id, None), None)
+        self._ring.appendleft(item)
+        self._by_id[item.id] = item
+        self._key_by_id[item.id] = key
+        self._content_keys[key] = item.id
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                added = await self.poll_once()
+                if added:
+                    logger.info(f"Ingested {added} news articles")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Keep serving what we have; the next poll retries
+                logger.warning(f"News ingestion failed: {e}")
+            await asyncio.sleep(self._interval)
@@ -0,0 +1,166 @@
+import asyncio
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional, Set
+
+from app.core.logger import logger
+from app.infrastructure.price_hub import ConflatingOutbox, PriceHub, deserialize_ticker
+
+# Wire format, both directions: one JSON document per line.
+#   worker -> feed: {"op": "subscribe" | "unsubscribe", "symbols": [...]}
+#   feed -> worker: a serialized MarketTicker (see serialize_ticker)
+
+
+class FeedServer:
+    """
+    Serves ticks from the feed process's PriceHub to web workers over a
+    Unix socket.
+
+    Each worker connection is just another hub subscriber: the hub polls a
+    symbol once for the union of all workers' interest, and a slow worker
+    only ever has the latest tick per symbol pending (ConflatingOutbox).
+    """
+
+    def __init__(self, hub: PriceHub, path: str):
+        self._hub = hub
+        self._path = Path(path)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict[asyncio.Task, asyncio.StreamWriter] = {}
+
+    async def start(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        # A socket file left behind by a crashed feed would block bind()
+        self._path.unlink(missing_ok=True)
+        self._server = await asyncio.start_unix_server(self._handle, path=str(self._path))
+        logger.info(f"Price feed listening on {self._path}")
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            # Closing worker connections lets their handlers finish on EOF
+            for writer in self._connections.values():
+                writer.close()
+            await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+        self._path.unlink(missing_ok=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        outbox = ConflatingOutbox()
+        symbols: Set[str] = set()
+        sender = asyncio.create_task(self._send(writer, outbox))
+        handler = asyncio.current_task()
+        self._connections[handler] = writer
+        logger.info("Web worker connected to price feed")
+        try:
+            async for line in reader:
+                try:
+                    command = json.loads(line)
+                    op, requested = command["op"], command["symbols"]
+                except (ValueError, KeyError, TypeError) as e:
+                    logger.warning(f"Ignoring malformed feed command: {e}")
+                    continue
+                for symbol in requested:
+                    if op == "subscribe" and symbol not in symbols:
+                        symbols.add(symbol)
+                        self._hub.subscribe(symbol, outbox)
+                    elif op == "unsubscribe" and symbol in symbols:
+                        symbols.discard(symbol)
+                        self._hub.unsubscribe(symbol, outbox)
+        except ConnectionError:
+            pass
+        finally:
+            sender.cancel()
+            for symbol in symbols:
+                self._hub.unsubscribe(symbol, outbox)
+            writer.close()
+            self._connections.pop(handler, None)
+            logger.info("Web worker disconnected from price feed")
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, outbox: ConflatingOutbox) -> None:
+        try:
+            while True:
+                _, ticks = await outbox.drain()
+                writer.write("".join(f"{tick.message}\n" for tick in ticks).encode())
+                await writer.drain()
+        except ConnectionError:
+            # Worker went away; closing ends its handler's read loop, which cleans up
+            writer.close()
+
+
+class RemotePriceHub(PriceHub):
+    """
+    PriceHub for web workers when a separate feed process owns upstream
+    polling (`python -m app.feed`).
+
+    Instead of starting a poller, the first local subscriber to a symbol
+    subscribes this worker to it on the feed socket; ticks received from
+    the feed are fanned out locally as usual. The connection is re-opened
+    on failure and current subscriptions are replayed.
+    """
+
+    def __init__(self, path: str, reconnect_delay: float):
+        super().__init__(provider=None)
+        self._path = path
+        self._reconnect_delay = reconnect_delay
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None
+
+    def _start(self, symbol: str) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._send({"op": "subscribe", "symbols": [symbol]})
+
+    def _stop(self, symbol: str) -> None:
+        self._send({"op": "unsubscribe", "symbols": [symbol]})
+
+    def _send(self, command: Dict[str, Any]) -> None:
+        # Commands are tiny and rare; while disconnected they are replayed on reconnect
+        if self._writer is not None:
+            self._writer.write(f"{json.dumps(command)}\n".encode())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await super().close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self._path)
+            except OSError as e:
+                logger.warning(f"Price feed unavailable at {self._path}: {e}")
+                await asyncio.sleep(self._reconnect_delay)
+                continue
+
+            self._writer = writer
+            logger.info(f"Connected to price feed at {self._path}")
+            self._send({"op": "subscribe", "symbols": sorted(self._subscribers)})
+            try:
+                async for line in reader:
+                    message = line.decode(errors="replace").rstrip("\n")
+                    try:
+                        ticker = deserialize_ticker(message)
+                    except Exception as e:
+                        # One bad line must not stop the stream
+                        logger.warning(f"Skipping malformed price feed line: {e!r}")
+                        continue
+                    # Ticks may still arrive briefly after the last local unsubscribe
+                    if ticker.symbol in self._subscribers:
+                        self.publish(ticker, message)
+            except Exception as e:
+                # Whatever went wrong, keep the reconnect loop alive
+                logger.error(f"Price feed connection error: {e!r}")
+            finally:
+                self._writer = None
+                writer.close()
+
+            logger.warning("Price feed connection lost, reconnecting")
+            await asyncio.sleep(self._reconnect_delay)
@@ -0,0 +1,166 @@
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import asdict
+from datetime import datetime
+from typing import Any, Deque, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.domain.interfaces import MarketDataProvider
+from app.domain.models import MarketTicker
+
+
+def serialize_ticker(ticker: MarketTicker) -> str:
+    data = asdict(ticker)
+    data["timestamp"] = data["timestamp"].isoformat()
+    return json.dumps(data)
+
+
+def deserialize_ticker(message: str) -> MarketTicker:
+    data = json.loads(message)
+    data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+    return MarketTicker(**data)
+
+
+class Tick(NamedTuple):
+    symbol: str
+    ticker: MarketTicker
+    message: str  # JSON, serialized once for all legacy subscribers
+    published_at: float  # time.monotonic() when the hub published it
+
+
+class ConflatingOutbox:
+    """
+    Per-client outbound buffer holding at most one pending tick per symbol.
+
+    When a client falls behind, a newer tick replaces the unsent one for
+    the same symbol instead of queueing behind it. Memory per client is
+    therefore bounded by its number of subscribed symbols, and publishing
+    never waits on a slow consumer.
+    """
+
+    def __init__(self, max_control: int = 32):
+        self._pending: Dict[str, Tick] = {}
+        self._control: Deque[Dict[str, Any]] = deque(maxlen=max_control)
+        self._ready = asyncio.Event()
+        self.conflated = 0
+
+    def offer(self, tick: Tick) -> None:
+        if tick.symbol in self._pending:
+            self.conflated += 1
+        self._pending[tick.symbol] = tick
+        self._ready.set()
+
+    def notify(self, message: Dict[str, Any]) -> None:
+        # Control replies (acks, errors) share the single sender with ticks
+        self._control.append(message)
+        self._ready.set()
+
+    def discard(self, symbol: str) -> None:
+        self._pending.pop(symbol, None)
+
+    async def drain(self) -> Tuple[List[Dict[str, Any]], List[Tick]]:
+        await self._ready.wait()
+        self._ready.clear()
+        control = list(self._control)
+        self._control.clear()
+        ticks = list(self._pending.values())
+        self._pending.clear()
+        return control, ticks
+
+
+class PriceHub:
+    """
+    Polls the market provider once per symbol and fans every tick out to
+    all subscribers of that symbol.
+
+    A symbol's poller starts with its first subscriber and is cancelled when
+    the last one leaves, so upstream load scales with distinct symbols,
+    not with open sockets.
+
+    `provider` may be None when ticks are pushed in through `publish()`
+    instead (see RemotePriceHub).
+    """
+
+    def __init__(
+        self,
+        provider: Optional[MarketDataProvider],
+        interval: float = settings.MARKET_POLL_INTERVAL,
+    ):
+        self._provider = provider
+        self._interval = interval
+        self._subscribers: Dict[str, Set[ConflatingOutbox]] = {}
+        self._pollers: Dict[str, asyncio.Task] = {}
+        self._latest: Dict[str, Tick] = {}
+
+    def subscribe(self, symbol: str, outbox: ConflatingOutbox) -> None:
+        # Late joiners get the last tick straight away instead of waiting a full cycle
+        if symbol in self._latest:
+            outbox.offer(self._latest[symbol])
+
+        subscribers = self._subscribers.setdefault(symbol, set())
+        subscribers.add(outbox)
+        if len(subscribers) == 1:
+            self._start(symbol)
+
+    def unsubscribe(self, symbol: str, outbox: ConflatingOutbox) -> None:
+        outbox.discard(symbol)
+        subscribers = self._subscribers.get(symbol)
+        if subscribers is None:
+            return
+        subscribers.discard(outbox)
+        if subscribers:
+            return
+
+        # Last subscriber left: stop polling this symbol
+        del self._subscribers[symbol]
+        self._latest.pop(symbol, None)
+        self._stop(symbol)
+
+    def subscriber_count(self, symbol: str) -> int:
+        return len(self._subscribers.get(symbol, ()))
+
+    @property
+    def active_symbols(self) -> Set[str]:
+        return set(self._subscribers)
+
+    async def close(self) -> None:
+        pollers = list(self._pollers.values())
+        for poller in pollers:
+            poller.cancel()
+        await asyncio.gather(*pollers, return_exceptions=True)
+        self._pollers.clear()
+        self._subscribers.clear()
+        self._latest.clear()
+
+    def _start(self, symbol: str) -> None:
+        logger.info(f"Starting price poller for {symbol}")
+        self._pollers[symbol] = asyncio.create_task(self._poll(symbol))
+
+    def _stop(self, symbol: str) -> None:
+        poller = self._pollers.pop(symbol, None)
+        if poller is not None:
+            logger.info(f"Stopping price poller for {symbol}")
+            poller.cancel()
+
+    async def _poll(self, symbol: str) -> None:
+        while True:
+            try:
+                ticker = await self._provider.generate_ticker(symbol)
+                self.publish(ticker)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Price poller error for {symbol}: {e}")
+
+            # Real API has rate limits (CoinGecko free: ~10-30 req/min)
+            await asyncio.sleep(self._interval)
+
+    def publish(self, ticker: MarketTicker, message: Optional[str] = None) -> None:
+        # `message` lets a caller that already holds the JSON skip re-serializing it
+        tick = Tick(ticker.symbol, ticker, message or serialize_ticker(ticker), time.monotonic())
+        self._latest[ticker.symbol] = tick
+        for outbox in self._subscribers.get(ticker.symbol, ()):
+            outbox.offer(tick)
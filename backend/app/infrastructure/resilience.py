@@ -1,26 +1,269 @@
-import pybreaker
+import asyncio
+import time
+from email.utils import parsedate_to_datetime
+from typing import Awaitable, Callable, List, Optional, Tuple, Type, TypeVar
+
+import httpx
+
+from app.core.config import settings
+from app.core.exceptions import ExternalServiceError
 from app.core.logger import logger
+from app.core.metrics import set_breaker_state, UPSTREAM_THROTTLED
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+
+class CircuitBreakerError(ExternalServiceError):
+    """Raised without calling the upstream while a breaker is open"""
+    pass
+
 
-class LogListener(pybreaker.CircuitBreakerListener):
-    def state_change(self, cb, old_state, new_state):
+class RateLimitedError(ExternalServiceError):
+    """Raised when no request budget is available for an upstream (locally or via 429)"""
+    pass
+
+
+class LogListener:
+    def state_change(self, cb: "AsyncCircuitBreaker", old_state: str, new_state: str):
         logger.warning(
-            f"Circuit Breaker '{cb.name}' changed state: {old_state.name} -> {new_state.name}"
+            f"Circuit Breaker '{cb.name}' changed state: {old_state} -> {new_state}"
         )
+        set_breaker_state(cb.name, new_state)
+
+
+class AsyncCircuitBreaker:
+    """
+    Circuit breaker that awaits the wrapped coroutine, so async failures
+    actually count towards `fail_max`.
+
+    After `fail_max` consecutive failures the breaker opens and rejects
+    calls for `reset_timeout` seconds. It then lets a single trial call
+    through (half-open): success closes it, failure re-opens it.
+    Exceptions listed in `excluded` pass through without counting, as do
+    4xx responses other than 429: the upstream answered, the request was
+    just bad (e.g. an invalid parameter from a caller).
+    """
+
+    def __init__(self, name: str, fail_max: int, reset_timeout: float,
+                 listeners: Optional[List[LogListener]] = None,
+                 excluded: Tuple[Type[BaseException], ...] = ()):
+        self.name = name
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._listeners = listeners or []
+        self._excluded = excluded
+        self._state = CLOSED
+        self._fail_counter = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    @property
+    def current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return self._state
+
+    @property
+    def fail_counter(self) -> int:
+        return self._fail_counter
+
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        state = self.current_state
+        if state == OPEN or (state == HALF_OPEN and self._trial_in_flight):
+            raise CircuitBreakerError(f"Circuit '{self.name}' is open")
+
+        trial = state == HALF_OPEN
+        if trial:
+            self._set_state(HALF_OPEN)
+            self._trial_in_flight = True
+        try:
+            result = await func()
+        except self._excluded:
+            raise
+        except Exception as e:
+            if not _is_client_error(e):
+                self._on_failure(trial)
+            raise
+        finally:
+            if trial:
+                self._trial_in_flight = False
+
+        self._on_success()
+        return result
+
+    def _on_success(self) -> None:
+        self._fail_counter = 0
+        if self._state != CLOSED:
+            self._set_state(CLOSED)
+
+    def _on_failure(self, trial: bool) -> None:
+        self._fail_counter += 1
+        if trial or self._fail_counter >= self.fail_max:
+            self._opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    def _set_state(self, new_state: str) -> None:
+        old_state, self._state = self._state, new_state
+        if old_state != new_state:
+            for listener in self._listeners:
+                listener.state_change(self, old_state, new_state)
+
+
+def _is_client_error(error: BaseException) -> bool:
+    if not isinstance(error, httpx.HTTPStatusError):
+        return False
+    status = error.response.status_code
+    return 400 <= status < 500 and status != 429
+
+
+class TokenBucket:
+    """
+    Token-bucket pacing for one upstream, with adaptive backoff.
+
+    Callers reserve a token and wait for it, but only up to `max_wait`;
+    if the next token is further away they get False and should serve a
+    cached or fallback value instead of spending a doomed request.
+
+    On a 429 the bucket is frozen for the Retry-After period and its rate
+    halved; each success then restores the rate gradually (AIMD).
+    """
+
+    def __init__(self, name: str, rate_per_minute: float, burst: int, min_rate_per_minute: float = 1.0):
+        self.name = name
+        self._base_rate = rate_per_minute / 60.0
+        self._min_rate = min(min_rate_per_minute, rate_per_minute) / 60.0
+        self._rate = self._base_rate
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+
+    @property
+    def rate_per_minute(self) -> float:
+        return self._rate * 60.0
+
+    async def acquire(self, max_wait: float) -> bool:
+        now = time.monotonic()
+        self._refill(now)
+
+        # Reserve a token now (possibly going negative) and wait for it to be earned
+        delay = max(0.0, self._blocked_until - now)
+        if self._tokens < 1.0:
+            delay = max(delay, (1.0 - self._tokens) / self._rate)
+        if delay > max_wait:
+            return False
+
+        self._tokens -= 1.0
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return True
+
+    def backoff(self, retry_after: Optional[float]) -> None:
+        now = time.monotonic()
+        pause = retry_after if retry_after is not None else 1.0 / self._rate
+        self._blocked_until = max(self._blocked_until, now + pause)
+        self._rate = max(self._min_rate, self._rate / 2)
+        # Drop any burst credit; the upstream has told us we're over budget
+        self._refill(now)
+        self._tokens = min(self._tokens, 0.0)
+        logger.warning(
+            f"Upstream '{self.name}' rate limited us; pausing {pause:.1f}s, "
+            f"rate now {self.rate_per_minute:.1f}/min"
+        )
+
+    def record_success(self) -> None:
+        if self._rate < self._base_rate:
+            self._rate = min(self._base_rate, self._rate + self._base_rate * 0.1)
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    # Retry-After is either delta-seconds or an HTTP date
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+async def guarded_call(
+    breaker: AsyncCircuitBreaker,
+    limiter: TokenBucket,
+    func: Callable[[], Awaitable[httpx.Response]],
+    max_wait: float = settings.RATE_LIMIT_MAX_WAIT,
+) -> httpx.Response:
+    """
+    Run an upstream request through its rate limiter and circuit breaker.
+
+    Raises RateLimitedError when no token is available within `max_wait`
+    or the upstream answers 429 (which also triggers limiter backoff),
+    and CircuitBreakerError while the breaker is open.
+    """
+    if breaker.current_state == OPEN:
+        raise CircuitBreakerError(f"Circuit '{breaker.name}' is open")
+    if not await limiter.acquire(max_wait):
+        UPSTREAM_THROTTLED.labels(upstream=limiter.name, reason="local").inc()
+        raise RateLimitedError(f"No request budget for '{limiter.name}'")
+
+    async def _call() -> httpx.Response:
+        try:
+            return await func()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 429:
+                UPSTREAM_THROTTLED.labels(upstream=limiter.name, reason="429").inc()
+                limiter.backoff(parse_retry_after(e.response.headers.get("Retry-After")))
+                raise RateLimitedError(f"'{limiter.name}' returned 429") from e
+            raise
+
+    response = await breaker.call(_call)
+    limiter.record_success()
+    return response
+
 
 # Circuit Breaker for Market Data (CoinGecko)
 # Trips if 3 failures occur. Resets after 60 seconds.
-market_breaker = pybreaker.CircuitBreaker(
-    fail_max=3,
-    reset_timeout=60,
+# 429s are handled by the rate limiter and don't count as failures.
+market_breaker = AsyncCircuitBreaker(
     name="market_api",
-    listeners=[LogListener()]
+    fail_max=settings.BREAKER_FAIL_MAX,
+    reset_timeout=settings.BREAKER_RESET_TIMEOUT,
+    listeners=[LogListener()],
+    excluded=(RateLimitedError,)
 )
 
 # Circuit Breaker for News Data (NewsAPI)
 # Trips if 3 failures occur. Resets after 60 seconds.
-news_breaker = pybreaker.CircuitBreaker(
-    fail_max=3,
-    reset_timeout=60,
+news_breaker = AsyncCircuitBreaker(
     name="news_api",
-    listeners=[LogListener()]
+    fail_max=settings.BREAKER_FAIL_MAX,
+    reset_timeout=settings.BREAKER_RESET_TIMEOUT,
+    listeners=[LogListener()],
+    excluded=(RateLimitedError,)
+)
+
+# Shared request budgets, one per upstream
+coingecko_limiter = TokenBucket(
+    "coingecko",
+    rate_per_minute=settings.COINGECKO_RATE_PER_MINUTE,
+    burst=settings.COINGECKO_BURST
+)
+newsapi_limiter = TokenBucket(
+    "newsapi",
+    rate_per_minute=settings.NEWSAPI_RATE_PER_MINUTE,
+    burst=settings.NEWSAPI_BURST
 )
+
+for _breaker in (market_breaker, news_breaker):
+    set_breaker_state(_breaker.name, _breaker.current_state)
@@ -0,0 +1,213 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from app.core.logger import logger
+from app.domain.interfaces import AIService
+from app.domain.models import NewsItem
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(text.strip().lower().encode("utf-8")).hexdigest()
+
+
+def sentiment_label(score: float) -> str:
+    if score >= 0.2:
+        return "Bullish"
+    if score <= -0.2:
+        return "Bearish"
+    return "Neutral"
+
+
+class SentimentCache:
+    """
+    Sentiment scores keyed by content hash: a bounded in-memory LRU backed
+    by a small SQLite table so scores survive restarts.
+
+    Only the most recent `max_entries` scores are kept in memory; older
+    ones are read back from SQLite on demand. All SQLite work runs in a
+    worker thread, off the event loop.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 10_000):
+        self._scores: "OrderedDict[str, float]" = OrderedDict()
+        self._max_entries = max_entries
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        if path:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS sentiment (hash TEXT PRIMARY KEY, score REAL NOT NULL)"
+            )
+            # Newest rows last, so the LRU starts with the most recent scores
+            rows = self._db.execute(
+                "SELECT hash, score FROM sentiment ORDER BY rowid DESC LIMIT ?", (max_entries,)
+            ).fetchall()
+            self._scores.update(reversed(rows))
+
+    def get(self, key: str) -> Optional[float]:
+        score = self._scores.get(key)
+        if score is not None:
+            self._scores.move_to_end(key)
+        return score
+
+    async def get_many(self, keys: List[str]) -> Dict[str, float]:
+        found = {key: score for key in keys if (score := self.get(key)) is not None}
+        missing = [key for key in keys if key not in found]
+        if self._db is not None and missing:
+            try:
+                stored = await asyncio.to_thread(self._read, missing)
+            except sqlite3.Error as e:
+                logger.error(f"Sentiment cache read failed: {e}")
+                stored = {}
+            self._remember(stored)
+            found.update(stored)
+        return found
+
+    async def put_many(self, scores: Dict[str, float]) -> None:
+        self._remember(scores)
+        if self._db is not None and scores:
+            try:
+                await asyncio.to_thread(self._write, list(scores.items()))
+            except sqlite3.Error as e:
+                # Still cached in memory; only persistence is lost
+                logger.error(f"Sentiment cache write failed: {e}")
+
+    def __len__(self) -> int:
+        return len(self._scores)
+
+    def close(self) -> None:
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def _remember(self, scores: Dict[str, float]) -> None:
+        for key, score in scores.items():
+            self._scores[key] = score
+            self._scores.move_to_end(key)
+        while len(self._scores) > self._max_entries:
+            self._scores.popitem(last=False)
+
+    def _read(self, keys: List[str]) -> Dict[str, float]:
+        found: Dict[str, float] = {}
+        with self._db_lock:
+            if self._db is None:
+                return found
+            # Stay well under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                found.update(self._db.execute(
+                    f"SELECT hash, score FROM sentiment WHERE hash IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ))
+        return found
+
+    def _write(self, rows: List[Tuple[str, float]]) -> None:
+        with self._db_lock:
+            if self._db is None:
+                return
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO sentiment (hash, score) VALUES (?, ?)", rows
+                )
+
+
+class SentimentEnricher:
+    """
+    Scores news items with the AI service in batches, with bounded
+    concurrency, and never scores the same content twice.
+    """
+
+    def __init__(self, ai_service: AIService, cache: SentimentCache,
+                 batch_size: int, max_concurrency: int):
+        self._ai = ai_service
+        self._cache = cache
+        self._batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def enrich(self, items: List[NewsItem]) -> List[NewsItem]:
+        texts = {content_hash(self._text(item)): self._text(item) for item in items if self._needs_score(item)}
+        scores = await self.score(texts)
+
+        enriched = []
+        for item in items:
+            score = scores.get(content_hash(self._text(item))) if self._needs_score(item) else None
+            if score is None:
+                enriched.append(item)
+            else:
+                # Copy rather than mutate: items may be shared with other requests
+                enriched.append(replace(item, sentiment_score=score, sentiment_label=sentiment_label(score)))
+        return enriched
+
+    async def score(self, texts: Dict[str, str]) -> Dict[str, float]:
+        """
+        Scores for {content_hash: text}. Cached and in-flight hashes are reused;
+        the rest are scored in batches. Failed batches are simply left out.
+        """
+        results = await self._cache.get_many(list(texts))
+        waiting: Dict[str, asyncio.Future] = {}
+        missing: Dict[str, str] = {}
+        for key, text in texts.items():
+            # Re-checked without awaiting: another caller may have scored it meanwhile
+            cached = results.get(key, self._cache.get(key))
+            if cached is not None:
+                results[key] = cached
+            elif key in self._in_flight:
+                waiting[key] = self._in_flight[key]
+            else:
+                missing[key] = text
+
+        loop = asyncio.get_running_loop()
+        for key in missing:
+            self._in_flight[key] = loop.create_future()
+
+        keys = list(missing)
+        batches = [keys[i:i + self._batch_size] for i in range(0, len(keys), self._batch_size)]
+        try:
+            await asyncio.gather(*(self._score_batch(batch, missing) for batch in batches))
+        finally:
+            for key in missing:
+                future = self._in_flight.pop(key)
+                if not future.done():
+                    # Cancelled mid-way: release anyone waiting on us
+                    future.set_result(None)
+                elif future.result() is not None:
+                    results[key] = future.result()
+        for key, future in waiting.items():
+            score = await asyncio.shield(future)
+            if score is not None:
+                results[key] = score
+        return results
+
+    async def _score_batch(self, keys: List[str], texts: Dict[str, str]) -> None:
+        scores: Dict[str, float] = {}
+        try:
+            async with self._semaphore:
+                values = await self._ai.analyze_sentiment_batch([texts[k] for k in keys])
+            scores = dict(zip(keys, values))
+        except Exception as e:
+            logger.error(f"Sentiment batch of {len(keys)} failed: {e}")
+        finally:
+            for key in keys:
+                future = self._in_flight[key]
+                if not future.done():
+                    future.set_result(scores.get(key))
+        # Waiters already have their scores; persisting doesn't hold them up
+        await self._cache.put_many(scores)
+
+    @staticmethod
+    def _text(item: NewsItem) -> str:
+        return f"{item.title}\n{item.summary or ''}"
+
+    @staticmethod
+    def _needs_score(item: NewsItem) -> bool:
+        # Items that arrive already scored (e.g. curated mock data) are left alone
+        return item.sentiment_score == 0.0 and item.sentiment_label == "Neutral"
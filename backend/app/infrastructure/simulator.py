@@ -0,0 +1,344 @@
+import hashlib
+import math
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.domain.models import MarketTicker, PriceHistory
+
+SECONDS_PER_DAY = 86_400
+SECONDS_PER_YEAR = 365 * SECONDS_PER_DAY
+
+# Random streams per (symbol, step); distinct ids keep the draws independent
+_TICK_STREAMS = 0
+_BAR_STREAMS = 8
+_CATCH_UP_STREAMS = 12
+
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _mix(x: np.ndarray) -> np.ndarray:
+    # splitmix64 finalizer: a cheap, well-distributed 64-bit hash (wraps on purpose)
+    z = x + _GOLDEN
+    z = (z ^ (z >> np.uint64(30))) * _MIX1
+    z = (z ^ (z >> np.uint64(27))) * _MIX2
+    return z ^ (z >> np.uint64(31))
+
+
+def _uniforms(keys: np.ndarray, steps: np.ndarray, stream: int) -> np.ndarray:
+    """
+    Uniforms in (0, 1) for broadcast (symbol key, step) pairs: a pure
+    function of (key, step, stream), so any slice of a path can be
+    regenerated exactly.
+    """
+    counters = _mix(steps.astype(np.uint64) * np.uint64(16) + np.uint64(stream))
+    bits = _mix(counters ^ keys)
+    return ((bits >> np.uint64(11)).astype(np.float64) + 0.5) * 2.0 ** -53
+
+
+def _normal_pair(keys: np.ndarray, steps: np.ndarray, stream: int) -> Tuple[np.ndarray, np.ndarray]:
+    # Box-Muller: two independent standard normals from two uniform streams
+    radius = np.sqrt(-2.0 * np.log(_uniforms(keys, steps, stream)))
+    angle = 2.0 * np.pi * _uniforms(keys, steps, stream + 1)
+    return radius * np.cos(angle), radius * np.sin(angle)
+
+
+def symbol_key(seed: int, symbol: str) -> int:
+    digest = hashlib.blake2b(f"{seed}:{symbol}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class MarketSimulator:
+    """
+    Seeded synthetic market for USE_MOCK_DATA mode.
+
+    Every symbol follows a geometric Brownian motion with Poisson jumps on
+    a fixed tick grid starting at a bar-aligned start time. Each tick's
+    shocks are hashed from (seed, symbol, tick index) rather than drawn
+    from a shared generator, so a symbol's path depends only on the seed:
+    not on which other symbols exist or how often it is read. Processes
+    started within the same bar see identical prices for the symbols they
+    know from the start (`initial_prices`).
+
+    A symbol first requested later catches up on the bars it missed at bar
+    resolution and only simulates the current bar tick by tick, so adding
+    one never costs more than one bar of ticks. Its path up to that point
+    therefore also depends on the bar in which it joined.
+
+    Time advances lazily on read, for all symbols at once in (ticks x
+    symbols) NumPy blocks. Completed bars are kept in a per-symbol ring of
+    `history_days`; the price history, latest price and 24h stats are all
+    read from the same path. Pre-start bars are generated backwards from
+    the initial price.
+
+    Volume per tick scales with elapsed time and with the size of the move
+    (jumps bring volume spikes), with lognormal noise on top.
+
+    Rows are never freed, so with a `universe` only those symbols can be
+    read (anything else raises KeyError; check `symbol in sim` first).
+    Without one every requested symbol is simulated.
+    """
+
+    _VOLUME_NOISE = 0.5
+    _CHUNK_ELEMENTS = 1 << 20  # bound on (ticks x symbols) generated at once
+
+    def __init__(
+        self,
+        seed: int = settings.SIM_SEED,
+        tick_seconds: float = settings.SIM_TICK_SECONDS,
+        bar_seconds: int = settings.SIM_BAR_SECONDS,
+        history_days: int = settings.SIM_HISTORY_DAYS,
+        volatility: float = settings.SIM_VOLATILITY,
+        drift: float = settings.SIM_DRIFT,
+        jump_intensity: float = settings.SIM_JUMP_INTENSITY,
+        jump_mean: float = settings.SIM_JUMP_MEAN,
+        jump_std: float = settings.SIM_JUMP_STD,
+        daily_volume: float = settings.SIM_DAILY_VOLUME,
+        volume_sensitivity: float = settings.SIM_VOLUME_SENSITIVITY,
+        initial_prices: Optional[Dict[str, float]] = None,
+        universe: Optional[Iterable[str]] = None,
+        default_price: float = 1000.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        ticks_per_bar = bar_seconds / tick_seconds
+        if abs(ticks_per_bar - round(ticks_per_bar)) > 1e-9 or ticks_per_bar < 1:
+            raise ValueError("bar_seconds must be a whole multiple of tick_seconds")
+        if SECONDS_PER_DAY % bar_seconds:
+            raise ValueError("bar_seconds must divide a day evenly")
+        if history_days < 1:
+            raise ValueError("history_days must be at least 1 (24h stats need a full day)")
+
+        self._seed = seed
+        self._dt = tick_seconds
+        self._bar_seconds = bar_seconds
+        self._ticks_per_bar = int(round(ticks_per_bar))
+        self._bars_per_day = SECONDS_PER_DAY // bar_seconds
+        self._ring = history_days * self._bars_per_day
+        self._sigma = volatility / math.sqrt(SECONDS_PER_YEAR)  # per second
+        self._mu = drift / SECONDS_PER_YEAR
+        self._jump_rate = jump_intensity / SECONDS_PER_DAY
+        self._jump_mean = jump_mean
+        self._jump_std = jump_std
+        self._volume_rate = daily_volume / SECONDS_PER_DAY
+        self._volume_sensitivity = volume_sensitivity
+        self._universe = None if universe is None else frozenset(universe)
+        self._initial_prices = {s: p for s, p in (initial_prices or {}).items() if s in self}
+        self._default_price = default_price
+        self._clock = clock
+
+        self._start = math.floor(clock() / bar_seconds) * bar_seconds
+        self._tick = 0  # last simulated tick, shared by all symbols
+
+        self._rows: Dict[str, int] = {}
+        capacity = max(8, len(self._initial_prices))
+        self._keys = np.zeros(capacity, dtype=np.uint64)
+        self._price = np.zeros(capacity)
+        self._bar_volume = np.zeros(capacity)  # volume so far in the current bar
+        self._closes = np.zeros((capacity, self._ring))
+        self._volumes = np.zeros((capacity, self._ring))
+
+        if self._initial_prices:
+            self._register(list(self._initial_prices))
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, symbol: str) -> bool:
+        return self._universe is None or symbol in self._universe
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._rows)
+
+    # --- Reads -------------------------------------------------------------------
+
+    def price(self, symbol: str) -> float:
+        self.advance()
+        row = self._row(symbol)  # may grow the arrays, so resolve it first
+        return round(float(self._price[row]), 2)
+
+    def prices(self, symbols: List[str]) -> Dict[str, float]:
+        self.advance()
+        rows = self._rows_for(symbols)
+        return dict(zip(symbols, np.round(self._price[rows], 2).tolist()))
+
+    def ticker(self, symbol: str) -> MarketTicker:
+        self.advance()
+        row = self._row(symbol)
+        bars = np.arange(self._bar() - self._bars_per_day, self._bar())
+        slots = bars % self._ring
+        # Same reference point as the first entry of a 1-day history
+        reference = self._closes[row, slots[0]]
+        volume = self._volumes[row, slots[1:]].sum() + self._bar_volume[row]
+        return MarketTicker(
+            symbol=symbol,
+            price=round(float(self._price[row]), 2),
+            timestamp=datetime.fromtimestamp(self._now(), timezone.utc).replace(tzinfo=None),
+            change_24h=round(float(self._price[row] / reference - 1.0) * 100, 2),
+            volume=round(float(volume), 2)
+        )
+
+    def history(self, symbol: str, days: int) -> PriceHistory:
+        """
+        One point per completed bar over the last `days` (capped at the
+        ring size), followed by the live price if the current bar has begun.
+        """
+        self.advance()
+        row = self._row(symbol)
+        count = min(self._ring, max(1, days) * self._bars_per_day)
+        bars = np.arange(self._bar() - count, self._bar())
+        slots = bars % self._ring
+
+        timestamps = (self._start + (bars + 1) * self._bar_seconds) * 1000
+        prices = self._closes[row, slots]
+        volumes = self._volumes[row, slots]
+        if self._tick % self._ticks_per_bar:
+            timestamps = np.append(timestamps, int(self._now() * 1000))
+            prices = np.append(prices, self._price[row])
+            volumes = np.append(volumes, self._bar_volume[row])
+
+        return PriceHistory(
+            symbol=symbol,
+            timestamps=timestamps.astype(np.int64),
+            prices=np.round(prices, 2),
+            volumes=np.round(volumes, 2)
+        )
+
+    # --- Simulation --------------------------------------------------------------
+
+    def advance(self, now: Optional[float] = None) -> None:
+        """
+        Simulate every symbol up to the last whole tick before `now`.
+        """
+        now = self._clock() if now is None else now
+        target = int((now - self._start) // self._dt)
+        if target > self._tick and self._rows:
+            self._simulate(np.arange(len(self._rows)), self._tick + 1, target)
+        self._tick = max(self._tick, target)
+
+    def _now(self) -> float:
+        return self._start + self._tick * self._dt
+
+    def _bar(self) -> int:
+        # Index of the bar the next tick belongs to; all earlier bars are complete
+        return self._tick // self._ticks_per_bar
+
+    def _simulate(self, rows: np.ndarray, first: int, last: int) -> None:
+        keys = self._keys[rows]
+        price = self._price[rows]
+        bar_volume = self._bar_volume[rows]
+        chunk = max(1, self._CHUNK_ELEMENTS // len(rows))
+
+        tick = first
+        while tick <= last:
+            # Never let a block straddle a bar boundary
+            bar_end = ((tick - 1) // self._ticks_per_bar + 1) * self._ticks_per_bar
+            end = min(last, bar_end, tick + chunk - 1)
+            returns, volumes = self._steps(keys, np.arange(tick, end + 1), self._dt, _TICK_STREAMS)
+            price = price * np.exp(returns.sum(axis=0))
+            bar_volume = bar_volume + volumes.sum(axis=0)
+            if end == bar_end:
+                slot = (end // self._ticks_per_bar - 1) % self._ring
+                self._closes[rows, slot] = price
+                self._volumes[rows, slot] = bar_volume
+                bar_volume = np.zeros_like(bar_volume)
+            tick = end + 1
+
+        self._price[rows] = price
+        self._bar_volume[rows] = bar_volume
+
+    def _steps(self, keys: np.ndarray, steps: np.ndarray, dt: float,
+               stream: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Log returns and traded volume, shaped (steps, symbols), for moves
+        of `dt` seconds each.
+        """
+        keys, steps = keys[None, :], steps[:, None]
+        shock, volume_shock = _normal_pair(keys, steps, stream)
+
+        scale = self._sigma * math.sqrt(dt)
+        returns = (self._mu - 0.5 * self._sigma ** 2) * dt + scale * shock
+        jumps = _uniforms(keys, steps, stream + 2) < self._jump_rate * dt
+        if jumps.any():
+            # Jumps are rare, so their sizes are only drawn where one happened
+            at_step, at_symbol = np.nonzero(jumps)
+            size, _ = _normal_pair(keys[0, at_symbol], steps[at_step, 0], stream + 3)
+            returns[at_step, at_symbol] += self._jump_mean + self._jump_std * size
+
+        # Bigger moves trade more; normalized so the average matches daily_volume
+        activity = 1.0 + self._volume_sensitivity * np.abs(returns - self._mu * dt) / scale
+        activity /= 1.0 + self._volume_sensitivity * math.sqrt(2.0 / math.pi)
+        noise = np.exp(self._VOLUME_NOISE * volume_shock - 0.5 * self._VOLUME_NOISE ** 2)
+        return returns, self._volume_rate * dt * activity * noise
+
+    def _row(self, symbol: str) -> int:
+        row = self._rows.get(symbol)
+        return row if row is not None else int(self._register([symbol])[0])
+
+    def _rows_for(self, symbols: List[str]) -> np.ndarray:
+        missing = [s for s in dict.fromkeys(symbols) if s not in self._rows]
+        if missing:
+            self._register(missing)
+        return np.array([self._rows[s] for s in symbols], dtype=np.int64)
+
+    def _register(self, symbols: List[str]) -> np.ndarray:
+        unknown = [s for s in symbols if s not in self]
+        if unknown:
+            raise KeyError(f"Not simulated: {', '.join(unknown)}")
+        first = len(self._rows)
+        while first + len(symbols) > len(self._keys):
+            self._grow()
+        rows = np.arange(first, first + len(symbols))
+        for row, symbol in zip(rows, symbols):
+            self._rows[symbol] = int(row)
+            self._keys[row] = symbol_key(self._seed, symbol)
+            self._price[row] = self._initial_prices.get(symbol, self._default_price)
+        self._bar_volume[rows] = 0.0
+        self._backfill(rows)
+        if self._tick:
+            self._catch_up(rows)
+        return rows
+
+    def _backfill(self, rows: np.ndarray) -> None:
+        # Bars before the start are generated backwards: bar -1 closes at the
+        # initial price, and each earlier close undoes the following bar's move
+        count = self._ring
+        returns, volumes = self._steps(
+            self._keys[rows], np.arange(1, count + 1), float(self._bar_seconds), _BAR_STREAMS
+        )
+        moves = np.vstack([np.zeros(len(rows)), np.cumsum(returns[:-1], axis=0)])
+        slots = -np.arange(1, count + 1) % self._ring
+        cells = np.ix_(rows, slots)
+        self._closes[cells] = self._price[rows][:, None] * np.exp(-moves.T)
+        self._volumes[cells] = volumes.T
+
+    def _catch_up(self, rows: np.ndarray) -> None:
+        # Completed bars since the start as one step each, then the ticks of the current bar
+        bars = self._bar()
+        keys = self._keys[rows]
+        price = self._price[rows]
+        chunk = max(1, self._CHUNK_ELEMENTS // len(rows))
+        for first in range(0, bars, chunk):
+            steps = np.arange(first, min(bars, first + chunk))
+            returns, volumes = self._steps(keys, steps, float(self._bar_seconds), _CATCH_UP_STREAMS)
+            closes = price * np.exp(np.cumsum(returns, axis=0))
+            cells = np.ix_(rows, steps % self._ring)
+            self._closes[cells] = closes.T
+            self._volumes[cells] = volumes.T
+            price = closes[-1]
+        self._price[rows] = price
+        if self._tick > bars * self._ticks_per_bar:
+            self._simulate(rows, bars * self._ticks_per_bar + 1, self._tick)
+
+    def _grow(self) -> None:
+        capacity = len(self._keys) * 2
+        for name in ("_keys", "_price", "_bar_volume", "_closes", "_volumes"):
+            current = getattr(self, name)
+            grown = np.zeros((capacity,) + current.shape[1:], dtype=current.dtype)
+            grown[:len(current)] = current
+            setattr(self, name, grown)
@@ -0,0 +1,203 @@
+import asyncio
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import quote
+
+import numpy as np
+
+from app.core.logger import logger
+from app.domain.models import PriceHistory
+
+# Fixed-width on-disk record: epoch ms, price, volume (24 bytes, little-endian)
+TICK_DTYPE = np.dtype([("ts", "<i8"), ("price", "<f8"), ("volume", "<f8")])
+
+_EMPTY = np.empty(0, dtype=TICK_DTYPE)
+
+
+class TickStore:
+    """
+    Append-only, per-symbol time-series store.
+
+    Each symbol has two files of fixed-width TICK_DTYPE records, both sorted
+    by timestamp:
+      - `<symbol>.raw.bin`  every observed tick (recent data)
+      - `<symbol>.bars.bin` older ticks rolled up into `bar_seconds` bars
+
+    Reads go through a read-only memory map and locate time ranges with a
+    binary search, so a query touches only the pages it returns.
+
+    Only one process may write to a store directory. Others (web workers
+    fed by the price feed process) open it `read_only`: appends and
+    compaction become no-ops while reads see the writer's data.
+    """
+
+    def __init__(self, root: str, bar_seconds: int, raw_retention_seconds: int,
+                 read_only: bool = False):
+        self._root = Path(root)
+        self._root.mkdir(parents=True, exist_ok=True)
+        self.read_only = read_only
+        self._bar_ms = bar_seconds * 1000
+        self._raw_retention_ms = raw_retention_seconds * 1000
+        self._last_ts: Dict[str, int] = {}
+        # Serializes appends against compaction (which may run in a worker thread)
+        self._lock = threading.Lock()
+
+    def append(self, symbol: str, ts_ms: int, price: float, volume: float = 0.0) -> bool:
+        if self.read_only:
+            return False
+        record = np.array([(ts_ms, price, volume)], dtype=TICK_DTYPE).tobytes()
+        path = self._path(symbol, "raw")
+        with self._lock:
+            last = self._last_ts.get(symbol)
+            if last is None:
+                self._truncate_torn_tail(path)
+                last = self._read_last_ts(symbol)
+            # Files stay sorted so range queries can binary search
+            if last is not None and ts_ms <= last:
+                return False
+            with open(path, "ab") as f:
+                f.write(record)
+            self._last_ts[symbol] = ts_ms
+        return True
+
+    def query(self, symbol: str, start_ms: int, end_ms: int) -> np.ndarray:
+        """
+        All records with start_ms <= ts <= end_ms, bars first then raw ticks.
+
+        Safe against a concurrent compaction in any process: that appends
+        bars before it drops the rolled-up raw ticks, so the raw file is
+        read first and any raw tick a bar already covers is skipped.
+        """
+        raw = self._map(self._path(symbol, "raw"))
+        bars = self._map(self._path(symbol, "bars"))
+        if len(raw) and len(bars):
+            # Bars are stamped at bucket start and cover the whole bucket
+            covered = int(bars["ts"][-1]) + self._bar_ms
+            raw = raw[np.searchsorted(raw["ts"], covered, side="left"):]
+
+        parts = []
+        for records in (bars, raw):
+            if len(records) == 0:
+                continue
+            ts = records["ts"]
+            lo = np.searchsorted(ts, start_ms, side="left")
+            hi = np.searchsorted(ts, end_ms, side="right")
+            if hi > lo:
+                # Copy out of the map so the file can be compacted underneath us
+                parts.append(np.array(records[lo:hi]))
+        del raw, bars
+        return np.concatenate(parts) if parts else _EMPTY
+
+    def history(self, symbol: str, start_ms: int, end_ms: int, max_gap_ms: int) -> Optional[PriceHistory]:
+        """
+        Local history for [start_ms, end_ms], or None unless the range is
+        fully covered with no hole wider than `max_gap_ms`.
+        """
+        max_gap_ms = max(max_gap_ms, 2 * self._bar_ms)
+        records = self.query(symbol, start_ms - max_gap_ms, end_ms)
+        if len(records) == 0:
+            return None
+
+        ts = records["ts"]
+        if ts[0] > start_ms + max_gap_ms or ts[-1] < end_ms - max_gap_ms:
+            return None
+        if len(ts) > 1:
+            steps = np.diff(ts)
+            if steps.max() > max_gap_ms:
+                return None
+            if steps.min() <= 0:
+                logger.warning(f"Tick store returned unordered records for {symbol}; going upstream")
+                return None
+
+        return PriceHistory(
+            symbol=symbol,
+            timestamps=ts.copy(),
+            prices=records["price"].copy(),
+            volumes=records["volume"].copy(),
+        )
+
+    def compact(self, now_ms: int) -> int:
+        """
+        Roll raw ticks older than the retention window into coarser bars
+        (last tick per bar) and drop them from the raw file.
+        Returns the number of raw ticks rolled up.
+        """
+        if self.read_only:
+            return 0
+        # Align the cutoff to a bar boundary so no bar is ever split across runs
+        cutoff = (now_ms - self._raw_retention_ms) // self._bar_ms * self._bar_ms
+        rolled = 0
+        for raw_path in sorted(self._root.glob("*.raw.bin")):
+            with self._lock:
+                rolled += self._compact_file(raw_path, cutoff)
+        return rolled
+
+    def _compact_file(self, raw_path: Path, cutoff: int) -> int:
+        raw = np.array(self._map(raw_path))
+        split = int(np.searchsorted(raw["ts"], cutoff, side="left"))
+        if split == 0:
+            return 0
+
+        old, recent = raw[:split], raw[split:]
+        buckets = old["ts"] // self._bar_ms
+        # Last tick of each bucket becomes the bar (close), stamped at bucket start
+        last = np.flatnonzero(np.r_[buckets[1:] != buckets[:-1], True])
+        bars = old[last].copy()
+        bars["ts"] = buckets[last] * self._bar_ms
+
+        bars_path = raw_path.with_name(raw_path.name.replace(".raw.bin", ".bars.bin"))
+        self._truncate_torn_tail(bars_path)
+        with open(bars_path, "ab") as f:
+            f.write(bars.tobytes())
+
+        tmp_path = raw_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(recent.tobytes())
+        os.replace(tmp_path, raw_path)
+        return split
+
+    @staticmethod
+    def _truncate_torn_tail(path: Path) -> None:
+        # A crash mid-write can leave a partial record; later appends must stay aligned
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return
+        if size % TICK_DTYPE.itemsize:
+            os.truncate(path, size - size % TICK_DTYPE.itemsize)
+
+    def _read_last_ts(self, symbol: str) -> Optional[int]:
+        for kind in ("raw", "bars"):
+            records = self._map(self._path(symbol, kind))
+            if len(records):
+                return int(records["ts"][-1])
+        return None
+
+    def _path(self, symbol: str, kind: str) -> Path:
+        return self._root / f"{quote(symbol, safe='')}.{kind}.bin"
+
+    @staticmethod
+    def _map(path: Path) -> np.ndarray:
+        try:
+            size = path.stat().st_size
+        except FileNotFoundError:
+            return _EMPTY
+        # Ignore a torn trailing record from an interrupted write
+        count = size // TICK_DTYPE.itemsize
+        if count == 0:
+            return _EMPTY
+        return np.memmap(path, dtype=TICK_DTYPE, mode="r", shape=(count,))
+
+
+async def compact_periodically(store: TickStore, interval: float) -> None:
+    while True:
+        try:
+            rolled = await asyncio.to_thread(store.compact, int(time.time() * 1000))
+            if rolled:
+                logger.info(f"Tick store compacted {rolled} raw ticks into bars")
+        except Exception as e:
+            logger.error(f"Tick store compaction failed: {e}")
+        await asyncio.sleep(interval)
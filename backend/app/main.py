@@ -1,16 +1,69 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from app.core.config import settings
 from app.core.logger import setup_logging
-from app.core.exceptions import global_exception_handler, infrastructure_exception_handler, InfrastructureError
+from app.core.exceptions import (
+    global_exception_handler, infrastructure_exception_handler, InfrastructureError,
+    overloaded_exception_handler, ServiceOverloadedError
+)
+from app.core.metrics import MetricsMiddleware, cache_collector, monitor_event_loop_lag
+from app.core.profiler import profiler
+from app.api import dependencies
+from app.infrastructure.http import COINGECKO_BASE_URL, NEWSAPI_BASE_URL
+from app.infrastructure.tick_store import compact_periodically
 
 # Setup Logging
 setup_logging()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pooled upstream clients live for the whole app lifetime
+    http_pool = dependencies.get_http_pool()
+    http_pool.client(COINGECKO_BASE_URL)
+    http_pool.client(NEWSAPI_BASE_URL)
+
+    # Warm the history cache for popular symbols without delaying startup.
+    # Not with a feed process: N workers warming at once would spend the
+    # upstream budget on startup instead of on requests
+    warm_task = None
+    if settings.MARKET_FEED_MODE != "remote":
+        warm_task = asyncio.create_task(
+            dependencies.get_market_provider().warm_history(
+                settings.MARKET_WARM_SYMBOLS, settings.MARKET_WARM_DAYS
+            )
+        )
+
+    tick_store = dependencies.get_tick_store()
+    compact_task = None
+    if tick_store is not None and not tick_store.read_only:
+        compact_task = asyncio.create_task(
+            compact_periodically(tick_store, settings.TICK_STORE_COMPACT_INTERVAL)
+        )
+    loop_lag_task = asyncio.create_task(monitor_event_loop_lag(settings.EVENT_LOOP_LAG_INTERVAL))
+    cache_collector.register("price_history", dependencies.get_history_cache().stats)
+    dependencies.get_news_ingester().start()
+
+    yield
+    if warm_task is not None:
+        warm_task.cancel()
+    if compact_task is not None:
+        compact_task.cancel()
+    loop_lag_task.cancel()
+    await dependencies.get_news_ingester().stop()
+    # Stop any symbol pollers still running
+    await dependencies.get_price_hub().close()
+    await dependencies.get_history_cache().close()
+    await http_pool.aclose()
+    dependencies.get_sentiment_cache().close()
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    lifespan=lifespan
 )
 
 # CORS
@@ -23,9 +76,13 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+# Per-route latency histograms
+app.add_middleware(MetricsMiddleware)
+
 # Exception Handlers
 app.add_exception_handler(Exception, global_exception_handler)
 app.add_exception_handler(InfrastructureError, infrastructure_exception_handler)
+app.add_exception_handler(ServiceOverloadedError, overloaded_exception_handler)
 
 from app.api.api import api_router
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -37,3 +94,26 @@ async def health_check():
 @app.get("/")
 async def root():
     return {"message": "Welcome to AetherAlpha API"}
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+@app.post("/debug/profiler/start", include_in_schema=False)
+async def start_profiler(interval_ms: float = Query(10.0, ge=1.0)):
+    """
+    Start sampling the event-loop thread's stacks.
+    """
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    profiler.start(interval_ms / 1000.0)
+    return {"running": True, "interval_ms": interval_ms}
+
+@app.post("/debug/profiler/stop", include_in_schema=False)
+async def stop_profiler():
+    """
+    Stop sampling and return collapsed stacks (flamegraph input).
+    """
+    if not settings.PROFILER_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    return Response(profiler.stop(), media_type="text/plain")
@@ -0,0 +1,68 @@
+"""
+Load-test and benchmark runner.
+
+    python -m benchmarks                      # all scenarios, compared to baselines
+    python -m benchmarks history_storm        # selected scenarios
+    python -m benchmarks --update-baseline    # record current results as the baseline
+
+Exits non-zero if any metric regresses past its allowance (see compare.CHECKS).
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks.compare import compare
+from benchmarks.runner import format_report, run_isolated
+from benchmarks.scenarios import SCENARIOS
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baselines.json"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", nargs="*", help=f"any of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="store these results as the new baseline instead of comparing")
+    parser.add_argument("--tolerance-scale", type=float, default=1.0,
+                        help="multiply every allowed deviation, e.g. 2.0 on slow CI runners")
+    parser.add_argument("--output", type=Path, help="also write raw results to this JSON file")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.scenarios if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(unknown)}")
+    names = args.scenarios or list(SCENARIOS)
+
+    results = {}
+    for name in names:
+        print(f"Running {name}: {SCENARIOS[name].description} ...", flush=True)
+        results[name] = run_isolated(SCENARIOS[name])
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    if args.update_baseline:
+        baselines.update(results)
+        args.baseline.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    regressions = []
+    for name, metrics in results.items():
+        comparisons = compare(baselines.get(name, {}), metrics, args.tolerance_scale)
+        print(format_report(name, comparisons))
+        regressions += [f"{name}.{c.metric}" for c in comparisons if c.regressed]
+
+    if regressions:
+        print(f"\nRegressions: {', '.join(regressions)}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
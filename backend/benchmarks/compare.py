@@ -0,0 +1,72 @@
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from typing import Dict, List, Optional
+
+
+@dataclass(frozen=True)
+class Check:
+    """
+    How a metric may move before it counts as a regression: by `tolerance`
+    (relative to the baseline) plus `slack` (absolute, for small noisy
+    values), in the direction that makes it worse.
+    """
+    pattern: str
+    higher_is_better: bool
+    tolerance: float
+    slack: float = 0.0
+
+
+# First matching check wins; metrics without one are reported but not judged
+CHECKS = [
+    Check("throughput_*", higher_is_better=True, tolerance=0.30),
+    # Tails move more run to run than medians
+    Check("latency_p99_*", higher_is_better=False, tolerance=1.00, slack=25.0),
+    Check("latency_*", higher_is_better=False, tolerance=0.50, slack=5.0),
+    Check("upstream_*", higher_is_better=False, tolerance=0.25, slack=2.0),
+    Check("peak_rss_mb", higher_is_better=False, tolerance=0.25, slack=10.0),
+    Check("errors", higher_is_better=False, tolerance=0.0, slack=0.0),
+    Check("articles_ingested", higher_is_better=True, tolerance=0.30),
+]
+
+
+@dataclass
+class Comparison:
+    metric: str
+    baseline: Optional[float]
+    current: float
+    limit: Optional[float]
+
+    @property
+    def regressed(self) -> bool:
+        if self.limit is None:
+            return False
+        check = find_check(self.metric)
+        return self.current < self.limit if check.higher_is_better else self.current > self.limit
+
+    @property
+    def change(self) -> Optional[float]:
+        if not self.baseline:
+            return None
+        return (self.current - self.baseline) / self.baseline
+
+
+def find_check(metric: str) -> Optional[Check]:
+    return next((c for c in CHECKS if fnmatch(metric, c.pattern)), None)
+
+
+def compare(baseline: Dict[str, float], current: Dict[str, float],
+            tolerance_scale: float = 1.0) -> List[Comparison]:
+    """
+    Compare one scenario's metrics to its baseline. `tolerance_scale`
+    widens (or tightens) every allowance, e.g. on slower CI machines.
+    """
+    results = []
+    for metric, value in sorted(current.items()):
+        reference = baseline.get(metric)
+        check = find_check(metric)
+        limit = None
+        if reference is not None and check is not None:
+            allowance = (abs(reference) * check.tolerance + check.slack) * tolerance_scale
+            limit = reference - allowance if check.higher_is_better else reference + allowance
+        results.append(Comparison(metric, reference, value, limit))
+    return results
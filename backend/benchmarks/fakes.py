@@ -0,0 +1,184 @@
+"""
+Local stand-ins for the upstream services, with injectable faults.
+
+CoinGecko and NewsAPI are real HTTP servers on loopback, so requests go
+through the app's actual adapters, pooled clients, rate limiters and
+breakers. The AI service has no HTTP client in the app yet, so its
+stand-in is an in-process AIService with the same fault knobs.
+"""
+import asyncio
+import random
+import threading
+import time
+import zlib
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse
+
+from app.infrastructure.simulator import MarketSimulator
+from benchmarks.runner import free_port
+from benchmarks.scenarios import FaultProfile
+
+
+class FaultInjector:
+    def __init__(self, profile: FaultProfile):
+        self.profile = profile
+        self._rng = random.Random(profile.seed)
+
+    async def delay(self) -> None:
+        p = self.profile
+        latency = p.latency_ms + (self._rng.uniform(-p.jitter_ms, p.jitter_ms) if p.jitter_ms else 0.0)
+        if latency > 0:
+            await asyncio.sleep(latency / 1000)
+
+    def failure(self) -> Optional[JSONResponse]:
+        roll = self._rng.random()
+        if roll < self.profile.throttle_rate:
+            return JSONResponse(
+                {"error": "rate limited"}, status_code=429,
+                headers={"Retry-After": str(self.profile.retry_after)}
+            )
+        if roll < self.profile.throttle_rate + self.profile.error_rate:
+            return JSONResponse({"error": "injected failure"}, status_code=500)
+        return None
+
+
+def _with_faults(app: FastAPI, injector: FaultInjector, calls: Counter) -> FastAPI:
+    @app.middleware("http")
+    async def inject(request: Request, call_next):
+        # Keyed by endpoint name: "price", "market_chart", "everything"
+        calls[request.url.path.rsplit("/", 1)[-1]] += 1
+        await injector.delay()
+        failure = injector.failure()
+        if failure is not None:
+            return failure
+        return await call_next(request)
+    return app
+
+
+def fake_coingecko(profile: FaultProfile, calls: Counter, seed: int = 1) -> FastAPI:
+    """
+    `/simple/price` and `/coins/{id}/market_chart`, priced by a seeded
+    simulator so every run serves the same market.
+    """
+    app = FastAPI()
+    market = MarketSimulator(seed=seed)
+
+    @app.get("/api/v3/simple/price")
+    async def simple_price(ids: str, vs_currencies: str = "usd"):
+        prices = market.prices(ids.split(","))
+        return {coin: {vs_currencies: price} for coin, price in prices.items()}
+
+    @app.get("/api/v3/coins/{coin_id}/market_chart")
+    async def market_chart(coin_id: str, days: int = 1, vs_currency: str = "usd"):
+        history = market.history(coin_id, days)
+        timestamps = history.timestamps.tolist()
+        return {
+            "prices": [list(p) for p in zip(timestamps, history.prices.tolist())],
+            "total_volumes": [list(v) for v in zip(timestamps, history.volumes.tolist())],
+        }
+
+    return _with_faults(app, FaultInjector(profile), calls)
+
+
+def fake_newsapi(profile: FaultProfile, calls: Counter, articles_per_call: int = 20) -> FastAPI:
+    """
+    `/everything` that publishes `articles_per_call` new articles on every
+    first-page request (a steady news burst) and, like NewsAPI, filters by
+    `from` and pages newest first.
+    """
+    app = FastAPI()
+    published: List[dict] = []
+    clock = {"now": datetime(2024, 1, 1, tzinfo=timezone.utc)}
+
+    @app.get("/v2/everything")
+    async def everything(pageSize: int = 20, page: int = 1, since: Optional[str] = Query(None, alias="from")):
+        # Only first pages count as new polls; deeper pages just page back
+        for _ in range(articles_per_call if page == 1 else 0):
+            clock["now"] += timedelta(seconds=1)
+            n = len(published)
+            published.append({
+                "source": {"name": f"Wire {n % 7}"},
+                "title": f"Market update #{n}: sector {n % 13} moves on volume",
+                "description": f"Synthetic article {n} for load testing.",
+                "url": f"https://news.invalid/articles/{n}",
+                "publishedAt": clock["now"].strftime("%Y-%m-%dT%H:%M:%SZ"),
+            })
+        # Timestamps share one format, so string comparison orders them
+        matching = [a for a in published if since is None or a["publishedAt"][:19] >= since]
+        newest_first = matching[::-1][(page - 1) * pageSize:page * pageSize]
+        return {"status": "ok", "totalResults": len(published), "articles": newest_first}
+
+    return _with_faults(app, FaultInjector(profile), calls)
+
+
+class FakeAIService:
+    """
+    In-process AIService with the same latency/error injection.
+    """
+
+    def __init__(self, profile: FaultProfile):
+        self._faults = FaultInjector(profile)
+        self.calls: Counter = Counter()
+
+    async def _call(self, kind: str) -> None:
+        self.calls[kind] += 1
+        await self._faults.delay()
+        if self._faults.failure() is not None:
+            raise RuntimeError("injected AI failure")
+
+    async def analyze_sentiment(self, text: str) -> float:
+        await self._call("sentiment")
+        return _score(text)
+
+    async def analyze_sentiment_batch(self, texts: List[str]) -> List[float]:
+        await self._call("sentiment_batch")
+        return [_score(text) for text in texts]
+
+    async def summarize_text(self, text: str) -> str:
+        await self._call("summary")
+        return text[:80]
+
+    async def stream_chat(self, message: str) -> AsyncIterator[str]:
+        await self._call("chat")
+        for word in ("Synthetic", "streamed", "answer."):
+            yield word + " "
+
+
+def _score(text: str) -> float:
+    # Deterministic stand-in for a model score in [-1, 1]
+    return round((zlib.crc32(text.encode()) % 2001) / 1000 - 1.0, 2)
+
+
+class BackgroundServer:
+    """
+    Serves an ASGI app on loopback from its own thread and event loop, so
+    upstream stand-ins don't compete with the app under test for its loop.
+    """
+
+    def __init__(self, app: FastAPI, port: Optional[int] = None):
+        self.port = port or free_port()
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning", lifespan="off")
+        )
+        self._thread = threading.Thread(target=self._server.run, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    def start(self) -> "BackgroundServer":
+        self._thread.start()
+        while not self._server.started:
+            if not self._thread.is_alive():
+                raise RuntimeError(f"Stand-in server on port {self.port} failed to start")
+            time.sleep(0.01)
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        self._thread.join(timeout=5)
@@ -0,0 +1,61 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks.compare import Comparison
+from benchmarks.scenarios import BASE_ENV, Scenario
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+SCENARIO_TIMEOUT = 300
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def run_isolated(scenario: Scenario) -> Dict[str, float]:
+    """
+    Run one scenario in a fresh interpreter so settings, caches, breakers
+    and memory measurements never leak between scenarios.
+    """
+    with tempfile.TemporaryDirectory(prefix=f"bench-{scenario.name}-") as tmp:
+        env = {
+            **os.environ,
+            **BASE_ENV,
+            **scenario.env,
+            "COINGECKO_BASE_URL": f"http://127.0.0.1:{free_port()}/api/v3",
+            "NEWSAPI_BASE_URL": f"http://127.0.0.1:{free_port()}/v2",
+            "TICK_STORE_DIR": str(Path(tmp) / "ticks"),
+            "SENTIMENT_CACHE_PATH": str(Path(tmp) / "sentiment.sqlite3"),
+        }
+        output = Path(tmp) / "result.json"
+        # App logs go to stdout; only the result file and errors matter here
+        process = subprocess.run(
+            [sys.executable, "-m", "benchmarks.workloads", scenario.name, str(output)],
+            cwd=BACKEND_DIR,
+            env=env,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            timeout=SCENARIO_TIMEOUT,
+        )
+        if process.returncode != 0:
+            raise RuntimeError(f"Scenario '{scenario.name}' failed:\n{process.stderr[-4000:]}")
+        return json.loads(output.read_text())
+
+
+def format_report(name: str, comparisons: List[Comparison]) -> str:
+    lines = [f"\n{name}", f"  {'metric':<34}{'baseline':>12}{'current':>12}{'change':>9}  status"]
+    for c in comparisons:
+        baseline = "-" if c.baseline is None else f"{c.baseline:.2f}"
+        change = "-" if c.change is None else f"{c.change:+.0%}"
+        status = "REGRESSED" if c.regressed else ("new" if c.baseline is None else "ok")
+        lines.append(f"  {c.metric:<34}{baseline:>12}{c.current:>12.2f}{change:>9}  {status}")
+    return "\n".join(lines)
@@ -0,0 +1,73 @@
+"""
+Benchmark scenario definitions.
+
+Plain data only: the runner reads these without importing the app, so
+each scenario's settings can be applied through the environment of the
+subprocess that runs it.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict
+
+
+@dataclass
+class FaultProfile:
+    """
+    Per-request faults for an upstream stand-in, drawn from a seeded RNG
+    so runs are repeatable.
+    """
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0  # share of requests answered with a 500
+    throttle_rate: float = 0.0  # share of requests answered with a 429
+    retry_after: int = 1
+    seed: int = 0
+
+
+@dataclass
+class Scenario:
+    name: str
+    description: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    env: Dict[str, str] = field(default_factory=dict)
+    coingecko: FaultProfile = field(default_factory=FaultProfile)
+    newsapi: FaultProfile = field(default_factory=FaultProfile)
+    ai: FaultProfile = field(default_factory=FaultProfile)
+
+
+# Applied to every scenario: real adapters against the stand-ins, with
+# local rate limits out of the way unless a scenario sets its own
+BASE_ENV = {
+    "USE_MOCK_DATA": "false",
+    "NEWS_API_KEY": "benchmark",
+    "COINGECKO_RATE_PER_MINUTE": "60000",
+    "COINGECKO_BURST": "100",
+    "NEWSAPI_RATE_PER_MINUTE": "6000",
+    "NEWSAPI_BURST": "10",
+    "HTTP2_ENABLED": "false",
+}
+
+SCENARIOS = {
+    s.name: s for s in [
+        Scenario(
+            name="ws_subscribers",
+            description="Concurrent multiplexed WebSocket subscribers sharing four symbols",
+            params={"clients": 200, "symbols_per_client": 2, "duration": 5.0},
+            env={"MARKET_POLL_INTERVAL": "0.25"},
+            coingecko=FaultProfile(latency_ms=40, jitter_ms=20, error_rate=0.02, throttle_rate=0.02, seed=1),
+        ),
+        Scenario(
+            name="history_storm",
+            description="Concurrent history requests across symbols and ranges",
+            params={"clients": 50, "requests_per_client": 40, "max_points": 200},
+            coingecko=FaultProfile(latency_ms=80, jitter_ms=40, error_rate=0.05, throttle_rate=0.05, seed=2),
+        ),
+        Scenario(
+            name="news_burst",
+            description="Readers polling /news while the ingester absorbs a burst of new articles",
+            params={"clients": 20, "duration": 4.0, "limit": 20},
+            env={"NEWS_POLL_INTERVAL": "0.1", "NEWS_PAGE_SIZE": "50"},
+            newsapi=FaultProfile(latency_ms=60, jitter_ms=30, error_rate=0.05, throttle_rate=0.05, seed=3),
+            ai=FaultProfile(latency_ms=30, jitter_ms=10, error_rate=0.02, seed=4),
+        ),
+    ]
+}
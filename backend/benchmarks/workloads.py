@@ -0,0 +1,224 @@
+"""
+Runs one scenario against the real app: `python -m benchmarks.workloads NAME OUTPUT`.
+
+Started by the runner in a fresh interpreter with the scenario's settings
+already in the environment, since the app reads them at import time.
+"""
+import asyncio
+import json
+import os
+import resource
+import sys
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List
+from urllib.parse import urlparse
+
+import httpx
+import numpy as np
+import uvicorn
+import websockets
+
+from app.api import dependencies
+from app.core.config import settings
+from app.infrastructure.external.market_client import SYMBOL_MAP
+from app.main import app
+from benchmarks.fakes import BackgroundServer, FakeAIService, fake_coingecko, fake_newsapi
+from benchmarks.runner import free_port
+from benchmarks.scenarios import SCENARIOS, Scenario
+
+SYMBOLS = list(SYMBOL_MAP)
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE")
+
+
+class Harness:
+    """
+    The app under test on a loopback port, wired to upstream stand-ins.
+    """
+
+    def __init__(self, scenario: Scenario):
+        self.scenario = scenario
+        self.coingecko_calls: Counter = Counter()
+        self.newsapi_calls: Counter = Counter()
+        self.ai = FakeAIService(scenario.ai)
+        self.peak_rss = 0
+        port = free_port()
+        self.http_url = f"http://127.0.0.1:{port}{settings.API_V1_STR}"
+        self.ws_url = f"ws://127.0.0.1:{port}{settings.API_V1_STR}"
+        self._server = uvicorn.Server(
+            uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", log_config=None)
+        )
+
+    async def __aenter__(self) -> "Harness":
+        self._upstreams = [
+            BackgroundServer(
+                fake_coingecko(self.scenario.coingecko, self.coingecko_calls),
+                port=urlparse(settings.COINGECKO_BASE_URL).port
+            ).start(),
+            BackgroundServer(
+                fake_newsapi(self.scenario.newsapi, self.newsapi_calls),
+                port=urlparse(settings.NEWSAPI_BASE_URL).port
+            ).start(),
+        ]
+        # The enricher resolves the AI service through this factory; routes
+        # captured the original as a dependency, so override that too
+        original = dependencies.get_ai_service
+        dependencies.get_ai_service = lambda: self.ai
+        app.dependency_overrides[original] = lambda: self.ai
+
+        self._serving = asyncio.create_task(self._server.serve())
+        while not self._server.started:
+            if self._serving.done():
+                self._serving.result()
+                raise RuntimeError("App server exited during startup")
+            await asyncio.sleep(0.01)
+        self._sampler = asyncio.create_task(self._sample_memory())
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self._sampler.cancel()
+        self._server.should_exit = True
+        await self._serving
+        for upstream in self._upstreams:
+            upstream.stop()
+
+    async def _sample_memory(self, interval: float = 0.05) -> None:
+        while True:
+            with open("/proc/self/statm") as statm:
+                self.peak_rss = max(self.peak_rss, int(statm.read().split()[1]) * PAGE_SIZE)
+            await asyncio.sleep(interval)
+
+    def upstream_metrics(self) -> Dict[str, float]:
+        counts = {
+            **{f"upstream_coingecko_{k}": v for k, v in self.coingecko_calls.items()},
+            **{f"upstream_newsapi_{k}": v for k, v in self.newsapi_calls.items()},
+            **{f"upstream_ai_{k}": v for k, v in self.ai.calls.items()},
+        }
+        # Fall back to the kernel's high-water mark where /proc isn't sampled
+        peak = self.peak_rss or resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        return {**counts, "peak_rss_mb": peak / 2**20}
+
+
+def latency_stats(samples_ms: List[float]) -> Dict[str, float]:
+    if not samples_ms:
+        return {"latency_p50_ms": 0.0, "latency_p99_ms": 0.0}
+    p50, p99 = np.percentile(samples_ms, [50, 99])
+    return {"latency_p50_ms": float(p50), "latency_p99_ms": float(p99)}
+
+
+async def ws_subscribers(h: Harness, clients: int, symbols_per_client: int, duration: float) -> Dict[str, float]:
+    """
+    Clients subscribe over the multiplexed socket and count tick updates.
+    Latency is tick age on arrival (receive time minus the tick's timestamp).
+    """
+    ages: List[float] = []
+    stats = Counter()
+    deadline = time.monotonic() + duration
+
+    async def client(i: int) -> None:
+        symbols = [SYMBOLS[(i + k) % len(SYMBOLS)] for k in range(symbols_per_client)]
+        try:
+            async with websockets.connect(f"{h.ws_url}/market/ws", max_size=None) as ws:
+                await ws.send(json.dumps({"op": "subscribe", "symbols": symbols}))
+                while (remaining := deadline - time.monotonic()) > 0:
+                    try:
+                        frame = json.loads(await asyncio.wait_for(ws.recv(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+                    if frame["t"] != "ticks":
+                        continue
+                    now_ms = time.time() * 1000
+                    for update in frame["d"]:
+                        stats["updates"] += 1
+                        if "ts" in update:
+                            ages.append(now_ms - update["ts"])
+        except (OSError, websockets.WebSocketException):
+            stats["errors"] += 1
+
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    return {
+        "throughput_updates_per_s": stats["updates"] / duration,
+        **latency_stats(ages),
+        "errors": stats["errors"],
+    }
+
+
+async def history_storm(h: Harness, clients: int, requests_per_client: int, max_points: int) -> Dict[str, float]:
+    """
+    Clients fire history requests back to back, cycling through symbols
+    and ranges in a fixed order.
+    """
+    ranges = [1, 7, 30]
+    latencies: List[float] = []
+    stats = Counter()
+
+    async with httpx.AsyncClient(base_url=h.http_url, timeout=30.0,
+                                 limits=httpx.Limits(max_connections=clients)) as http:
+        async def client(i: int) -> None:
+            for j in range(requests_per_client):
+                n = j * clients + i
+                symbol, days = SYMBOLS[n % len(SYMBOLS)], ranges[(n // len(SYMBOLS)) % len(ranges)]
+                start = time.perf_counter()
+                response = await http.get(f"/market/history/{symbol}",
+                                          params={"days": days, "max_points": max_points})
+                latencies.append((time.perf_counter() - start) * 1000)
+                stats["errors"] += response.status_code != 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(client(i) for i in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "throughput_rps": len(latencies) / elapsed,
+        **latency_stats(latencies),
+        "errors": stats["errors"],
+    }
+
+
+async def news_burst(h: Harness, clients: int, duration: float, limit: int) -> Dict[str, float]:
+    """
+    Readers poll /news while the ingester pulls a steady stream of new
+    articles and scores them.
+    """
+    latencies: List[float] = []
+    stats = Counter()
+    deadline = time.monotonic() + duration
+
+    async with httpx.AsyncClient(base_url=h.http_url, timeout=30.0,
+                                 limits=httpx.Limits(max_connections=clients)) as http:
+        async def client() -> None:
+            while time.monotonic() < deadline:
+                start = time.perf_counter()
+                response = await http.get("/news/", params={"limit": limit})
+                latencies.append((time.perf_counter() - start) * 1000)
+                stats["errors"] += response.status_code != 200
+
+        await asyncio.gather(*(client() for _ in range(clients)))
+
+    return {
+        "throughput_rps": len(latencies) / duration,
+        **latency_stats(latencies),
+        "errors": stats["errors"],
+        "articles_ingested": len(dependencies.get_news_ingester()),
+    }
+
+
+WORKLOADS: Dict[str, Callable[..., Any]] = {
+    "ws_subscribers": ws_subscribers,
+    "history_storm": history_storm,
+    "news_burst": news_burst,
+}
+
+
+async def run(name: str) -> Dict[str, float]:
+    scenario = SCENARIOS[name]
+    async with Harness(scenario) as h:
+        metrics = await WORKLOADS[name](h, **scenario.params)
+    metrics.update(h.upstream_metrics())
+    return {k: round(float(v), 3) for k, v in sorted(metrics.items())}
+
+
+if __name__ == "__main__":
+    name, output = sys.argv[1:3]
+    with open(output, "w") as f:
+        json.dump(asyncio.run(run(name)), f)
@@ -0,0 +1,30 @@
+from datetime import datetime
+
+import pytest
+
+from app.domain.models import MarketTicker
+
+
+class CountingProvider:
+    """
+    Market data provider stub: counts ticker lookups and moves the price
+    by one on each.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_ticker(self, symbol: str) -> MarketTicker:
+        self.calls += 1
+        return MarketTicker(
+            symbol=symbol,
+            price=100.0 + self.calls,
+            timestamp=datetime.utcnow(),
+            change_24h=0.0,
+            volume=0.0
+        )
+
+
+@pytest.fixture
+def provider() -> CountingProvider:
+    return CountingProvider()
@@ -24,3 +24,44 @@ async def test_market_websocket():
     # WebSocket testing requires TestClient or specific async setup
     # For MVP we skip complex WS testing in this file
     pass
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.get("/health")
+        response = await ac.get("/metrics")
+    assert response.status_code == 200
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"}' in response.text
+    assert "circuit_breaker_state" in response.text
+
+@pytest.mark.asyncio
+async def test_history_rejects_out_of_range_days():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        for days in (0, -1, 366):
+            response = await ac.get(f"/api/v1/market/history/BTC-USD?days={days}")
+            assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_news_rejects_out_of_range_limit():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.get("/api/v1/news/?limit=-1")
+    assert response.status_code == 422
+
+@pytest.mark.asyncio
+async def test_metrics_route_label_uses_route_template():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        await ac.get("/api/v1/market/history/history")
+        response = await ac.get("/metrics")
+    assert 'route="/api/v1/market/history/{symbol}"' in response.text
+    assert 'route="/api/v1/market/{symbol}/{symbol}"' not in response.text
+
+def test_metric_symbol_labels_are_bounded():
+    from app.core.metrics import symbol_label
+    assert symbol_label("BTC-USD") == "BTC-USD"
+    assert symbol_label("../../etc/passwd") == "other"
+
+@pytest.mark.asyncio
+async def test_profiler_rejects_tiny_intervals():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/debug/profiler/start?interval_ms=0")
+    assert response.status_code == 422
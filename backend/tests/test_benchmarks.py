@@ -0,0 +1,69 @@
+from collections import Counter
+
+import pytest
+from httpx import AsyncClient
+
+from benchmarks.compare import compare
+from benchmarks.fakes import FaultInjector, fake_coingecko
+from benchmarks.scenarios import FaultProfile
+
+
+def by_metric(comparisons):
+    return {c.metric: c for c in comparisons}
+
+
+def test_compare_flags_regressions_in_the_worse_direction_only():
+    baseline = {"throughput_rps": 100.0, "latency_p50_ms": 20.0, "errors": 0, "upstream_coingecko_price": 10}
+    current = {"throughput_rps": 150.0, "latency_p50_ms": 60.0, "errors": 1, "upstream_coingecko_price": 8}
+
+    result = by_metric(compare(baseline, current))
+
+    assert not result["throughput_rps"].regressed
+    assert result["latency_p50_ms"].regressed  # limit is 20 * 1.5 + 5
+    assert result["errors"].regressed
+    assert not result["upstream_coingecko_price"].regressed
+
+
+def test_compare_tolerance_scale_and_unknown_metrics():
+    baseline = {"throughput_rps": 100.0, "queue_depth": 1.0}
+    current = {"throughput_rps": 60.0, "queue_depth": 50.0, "latency_p99_ms": 900.0}
+
+    strict = by_metric(compare(baseline, current))
+    loose = by_metric(compare(baseline, current, tolerance_scale=2.0))
+
+    assert strict["throughput_rps"].regressed
+    assert not loose["throughput_rps"].regressed
+    # No check for it, and no baseline for the other: reported, never judged
+    assert not strict["queue_depth"].regressed
+    assert strict["latency_p99_ms"].baseline is None and not strict["latency_p99_ms"].regressed
+
+
+def test_fault_injection_is_seeded():
+    profile = FaultProfile(error_rate=0.2, throttle_rate=0.1, seed=5)
+    injectors = [FaultInjector(profile), FaultInjector(profile)]
+    draws = [[getattr(i.failure(), "status_code", 200) for _ in range(200)] for i in injectors]
+
+    assert draws[0] == draws[1]
+    counts = Counter(draws[0])
+    assert set(counts) == {200, 429, 500}
+    assert 0.6 < counts[200] / 200 < 0.8
+
+
+@pytest.mark.asyncio
+async def test_fake_coingecko_serves_and_counts_calls():
+    calls = Counter()
+    app = fake_coingecko(FaultProfile(throttle_rate=1.0), calls)
+
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/v3/simple/price", params={"ids": "bitcoin", "vs_currencies": "usd"})
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "1"
+    assert calls == {"price": 1}
+
+    app = fake_coingecko(FaultProfile(), calls)
+    async with AsyncClient(app=app, base_url="http://test") as client:
+        response = await client.get("/api/v3/simple/price", params={"ids": "bitcoin", "vs_currencies": "usd"})
+
+    assert response.json()["bitcoin"]["usd"] > 0
+    assert calls == {"price": 2}
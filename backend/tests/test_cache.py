@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from app.infrastructure.cache import AsyncTTLCache
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return self.calls
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_and_single_flight():
+    cache = AsyncTTLCache(max_entries=8, stale_ttl=0)
+    load = Loader()
+
+    values = await asyncio.gather(*(cache.get("k", load, ttl=60) for _ in range(10)))
+    assert values == [1] * 10
+    assert load.calls == 1
+
+    assert await cache.get("k", load, ttl=60) == 1
+    assert cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_stale_while_revalidating():
+    cache = AsyncTTLCache(max_entries=8, stale_ttl=60)
+    load = Loader()
+
+    await cache.get("k", load, ttl=0)
+    # Expired but within the stale window: old value now, refresh in background
+    assert await cache.get("k", load, ttl=60) == 1
+    await asyncio.sleep(0.01)
+    assert load.calls == 2
+    assert await cache.get("k", load, ttl=60) == 2
+    assert cache.stats()["stale_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used():
+    cache = AsyncTTLCache(max_entries=2, stale_ttl=0)
+    cache.set("a", 1, ttl=60)
+    cache.set("b", 2, ttl=60)
+    await cache.get("a", Loader(), ttl=60)
+    cache.set("c", 3, ttl=60)
+
+    assert await cache.get("a", Loader(), ttl=60) == 1
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+
+
+class Sized:
+    def __init__(self, nbytes: int):
+        self.nbytes = nbytes
+
+
+def test_cache_evicts_by_total_bytes():
+    cache = AsyncTTLCache(max_entries=100, stale_ttl=0, max_bytes=1000)
+    cache.set("day", Sized(100), ttl=60)
+    cache.set("week", Sized(300), ttl=60)
+    cache.set("year", Sized(800), ttl=60)
+
+    # One large entry displaces several small ones
+    assert cache.stats()["size"] == 1
+    assert cache.stats()["bytes"] == 800
+    assert cache.stats()["evictions"] == 2
+
+    cache.set("year", Sized(500), ttl=60)
+    cache.set("day", Sized(100), ttl=60)
+    assert cache.stats()["bytes"] == 600
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_load():
+    cache = AsyncTTLCache(max_entries=8, stale_ttl=0)
+    release = asyncio.Event()
+
+    async def slow_loader():
+        await release.wait()
+        return "value"
+
+    first = asyncio.create_task(cache.get("k", slow_loader, ttl=60))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache.get("k", slow_loader, ttl=60))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await follower == "value"
+    assert first.cancelled()
+    assert await cache.get("k", Loader(), ttl=60) == "value"
@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+from httpx import AsyncClient
+
+from app.api import dependencies
+from app.core.concurrency import AdmissionLimiter
+from app.core.exceptions import ServiceOverloadedError
+from app.main import app
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_sends_events():
+    async with AsyncClient(app=app, base_url="http://test") as ac:
+        response = await ac.post("/api/v1/chat/stream", json={"message": "hello"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("data: ")
+    assert "event: done" in response.text
+    assert dependencies.get_ai_limiter().active == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_sheds_load_when_queue_full():
+    limiter = AdmissionLimiter("test", max_concurrency=1, max_queue=1, queue_timeout=1.0, retry_after=3)
+    await limiter.acquire()
+    queued = asyncio.create_task(limiter.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(ServiceOverloadedError) as exc:
+        await limiter.acquire()
+    assert exc.value.retry_after == 3
+
+    limiter.release()
+    await queued
+    assert limiter.active == 1
+
+
+@pytest.mark.asyncio
+async def test_chat_returns_503_with_retry_after_when_overloaded():
+    limiter = AdmissionLimiter("test", max_concurrency=1, max_queue=0, queue_timeout=1.0, retry_after=5)
+    await limiter.acquire()
+    app.dependency_overrides[dependencies.get_ai_limiter] = lambda: limiter
+    try:
+        async with AsyncClient(app=app, base_url="http://test") as ac:
+            response = await ac.post("/api/v1/chat/stream", json={"message": "hello"})
+    finally:
+        app.dependency_overrides.clear()
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "5"
@@ -0,0 +1,43 @@
+import numpy as np
+
+from app.domain.downsampling import lttb_indices
+from app.domain.models import PriceHistory
+
+
+def test_lttb_keeps_endpoints_and_peaks():
+    x = np.arange(1000)
+    y = np.zeros(1000)
+    y[500] = 100.0  # a single spike must survive downsampling
+
+    idx = lttb_indices(x, y, 50)
+
+    assert len(idx) == 50
+    assert idx[0] == 0 and idx[-1] == 999
+    assert 500 in idx
+    assert np.all(np.diff(idx) > 0)
+
+
+def test_lttb_returns_everything_below_threshold():
+    assert lttb_indices(np.arange(10), np.arange(10), 50).tolist() == list(range(10))
+
+
+def test_price_history_downsample_and_records():
+    n = 5000
+    history = PriceHistory(
+        symbol="BTC-USD",
+        timestamps=np.arange(n, dtype=np.int64) * 60_000,
+        prices=np.linspace(100.0, 200.0, n),
+        volumes=np.ones(n)
+    )
+
+    records = history.downsample(300).to_records()
+
+    assert len(records) == 300
+    assert records[0] == {
+        "symbol": "BTC-USD",
+        "price": 100.0,
+        "timestamp": "1970-01-01T00:00:00.000",
+        "change_24h": 0.0,
+        "volume": 1.0,
+    }
+    assert records[-1]["price"] == 200.0
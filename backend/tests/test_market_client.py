@@ -0,0 +1,81 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.infrastructure.cache import AsyncTTLCache
+from app.infrastructure.external.market_client import CoinGeckoPriceBatcher, MarketDataProviderImpl
+from app.infrastructure.resilience import AsyncCircuitBreaker, TokenBucket
+
+
+def make_batcher(pool) -> CoinGeckoPriceBatcher:
+    # Private breaker/limiter so tests don't share the app-wide request budget
+    return CoinGeckoPriceBatcher(
+        pool,
+        window=0.01,
+        breaker=AsyncCircuitBreaker("test", fail_max=3, reset_timeout=60),
+        limiter=TokenBucket("test", rate_per_minute=6000, burst=100)
+    )
+
+
+class StubPool:
+    """Routes CoinGecko calls to an in-process handler."""
+
+    def __init__(self, handler):
+        self.requests = []
+
+        def record(request: httpx.Request) -> httpx.Response:
+            self.requests.append(request)
+            return handler(request)
+
+        self._client = httpx.AsyncClient(
+            base_url="https://api.coingecko.com/api/v3",
+            transport=httpx.MockTransport(record)
+        )
+
+    def client(self, base_url: str) -> httpx.AsyncClient:
+        return self._client
+
+
+def simple_price(request: httpx.Request) -> httpx.Response:
+    ids = request.url.params["ids"].split(",")
+    return httpx.Response(200, json={coin_id: {"usd": 100.0} for coin_id in ids})
+
+
+@pytest.mark.asyncio
+async def test_batcher_coalesces_same_symbol():
+    pool = StubPool(simple_price)
+    batcher = make_batcher(pool)
+
+    prices = await asyncio.gather(*(batcher.get("bitcoin") for _ in range(20)))
+
+    assert prices == [100.0] * 20
+    assert len(pool.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_batcher_merges_symbols_into_one_request():
+    pool = StubPool(simple_price)
+    batcher = make_batcher(pool)
+
+    prices = await batcher.get_many(["bitcoin", "ethereum", "solana"])
+
+    assert prices == {"bitcoin": 100.0, "ethereum": 100.0, "solana": 100.0}
+    assert len(pool.requests) == 1
+    assert pool.requests[0].url.params["ids"] == "bitcoin,ethereum,solana"
+
+
+@pytest.mark.asyncio
+async def test_mock_mode_serves_unknown_symbols_without_simulating_them(monkeypatch):
+    monkeypatch.setattr(settings, "USE_MOCK_DATA", True)
+    provider = MarketDataProviderImpl(StubPool(simple_price), AsyncTTLCache(max_entries=8, stale_ttl=60))
+    unknown = [f"SYM-{i}" for i in range(100)]
+
+    prices = await provider.get_latest_prices(["BTC-USD"] + unknown)
+    assert list(prices) == ["BTC-USD"] + unknown
+    for symbol in unknown[:10]:
+        assert (await provider.generate_ticker(symbol)).price > 0
+        assert len(await provider.get_price_history(symbol, 1)) == 24
+
+    assert set(provider.simulator.symbols) <= set(settings.SIM_SYMBOLS)
@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+import pytest
+
+from app.domain.models import NewsItem
+from app.infrastructure.news_ingester import NewsIngester
+
+T0 = datetime(2024, 5, 1, 12, 0, 0)
+
+
+def article(i: int, title: Optional[str] = None) -> NewsItem:
+    return NewsItem(
+        id=f"id-{i}",
+        title=title or f"Headline {i}",
+        url=f"https://example.com/{i}",
+        source="Test",
+        published_at=T0 + timedelta(minutes=i)
+    )
+
+
+class ScriptedClient:
+    def __init__(self, pages: List[List[NewsItem]]):
+        self.pages = pages
+        self.since: List[Optional[datetime]] = []
+
+    async def fetch_since(self, since: Optional[datetime], page_size: int, page: int = 1) -> List[NewsItem]:
+        self.since.append(since)
+        return self.pages.pop(0) if self.pages else []
+
+
+@pytest.mark.asyncio
+async def test_ingester_is_incremental_and_dedupes():
+    client = ScriptedClient([
+        [article(2), article(1)],
+        # Overlapping page: same article again, plus a syndicated copy with a new URL
+        [article(3), article(2), NewsItem(**{**article(2).__dict__, "id": "copy", "url": "https://mirror/2"})],
+    ])
+    ingester = NewsIngester(client, None, capacity=10, page_size=50, interval=60)
+
+    assert await ingester.poll_once() == 2
+    assert await ingester.poll_once() == 1
+
+    assert client.since == [None, T0 + timedelta(minutes=2)]
+    assert [item.id for item in ingester.latest(10)] == ["id-3", "id-2", "id-1"]
+    assert ingester.get("id-1").title == "Headline 1"
+
+
+@pytest.mark.asyncio
+async def test_ingester_ring_is_bounded():
+    client = ScriptedClient([[article(i) for i in range(5)]])
+    ingester = NewsIngester(client, None, capacity=3, page_size=50, interval=60)
+
+    await ingester.poll_once()
+
+    assert len(ingester) == 3
+    assert [item.id for item in ingester.latest(2)] == ["id-4", "id-3"]
+    assert ingester.get("id-0") is None
+
+
+@pytest.mark.asyncio
+async def test_ingester_pages_back_through_bursts():
+    newest_first = [article(i) for i in range(12, 0, -1)]
+    client = ScriptedClient([
+        [article(1)],
+        # 11 new articles with page_size 4: keep paging until article 1 shows up again
+        newest_first[0:4], newest_first[4:8], newest_first[8:12],
+    ])
+    ingester = NewsIngester(client, None, capacity=20, page_size=4, interval=60)
+
+    await ingester.poll_once()
+    assert await ingester.poll_once() == 11
+
+    assert len(client.since) == 4
+    assert [item.id for item in ingester.latest(20)] == [f"id-{i}" for i in range(12, 0, -1)]
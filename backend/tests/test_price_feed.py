@@ -0,0 +1,110 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from app.domain.models import MarketTicker
+from app.infrastructure.price_feed import FeedServer, RemotePriceHub
+from app.infrastructure.price_hub import ConflatingOutbox, PriceHub, serialize_ticker
+
+
+async def next_tick(outbox: ConflatingOutbox):
+    while True:
+        _, ticks = await asyncio.wait_for(outbox.drain(), timeout=2.0)
+        if ticks:
+            return ticks[-1]
+
+
+@pytest.mark.asyncio
+async def test_workers_share_one_upstream_poller(tmp_path, provider):
+    feed_hub = PriceHub(provider, interval=0.05)
+    server = FeedServer(feed_hub, str(tmp_path / "feed.sock"))
+    await server.start()
+    workers = [RemotePriceHub(str(tmp_path / "feed.sock"), reconnect_delay=0.01) for _ in range(3)]
+
+    outboxes = [ConflatingOutbox() for _ in workers]
+    for worker, outbox in zip(workers, outboxes):
+        worker.subscribe("BTC-USD", outbox)
+    ticks = [await next_tick(outbox) for outbox in outboxes]
+
+    # Every worker sees the feed's single price stream
+    assert feed_hub.active_symbols == {"BTC-USD"}
+    assert feed_hub.subscriber_count("BTC-USD") == 3
+    assert all(json.loads(t.message)["symbol"] == "BTC-USD" for t in ticks)
+    latest = [await next_tick(outbox) for outbox in outboxes]
+    assert len({t.ticker.price for t in latest}) == 1
+
+    # The feed stops polling once no worker is interested
+    for worker, outbox in zip(workers, outboxes):
+        worker.unsubscribe("BTC-USD", outbox)
+    for _ in range(100):
+        if not feed_hub.active_symbols:
+            break
+        await asyncio.sleep(0.01)
+    assert feed_hub.active_symbols == set()
+
+    for worker in workers:
+        await worker.close()
+    await server.close()
+    await feed_hub.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_resubscribes_after_feed_restart(tmp_path, provider):
+    path = str(tmp_path / "feed.sock")
+    worker = RemotePriceHub(path, reconnect_delay=0.01)
+    outbox = ConflatingOutbox()
+    # Feed not up yet: the worker keeps retrying
+    worker.subscribe("ETH-USD", outbox)
+    await asyncio.sleep(0.05)
+    assert not worker.connected
+
+    feed_hub = PriceHub(provider, interval=0.05)
+    server = FeedServer(feed_hub, path)
+    await server.start()
+    tick = await next_tick(outbox)
+    assert tick.symbol == "ETH-USD"
+
+    # Feed restarts: the worker reconnects and replays its subscription
+    await server.close()
+    await feed_hub.close()
+    for _ in range(100):
+        if not worker.connected:
+            break
+        await asyncio.sleep(0.01)
+    assert not worker.connected
+
+    feed_hub = PriceHub(provider, interval=0.05)
+    server = FeedServer(feed_hub, path)
+    await server.start()
+    await next_tick(outbox)  # may still be one from the old feed
+    tick = await next_tick(outbox)
+    assert tick.symbol == "ETH-USD"
+    assert feed_hub.active_symbols == {"ETH-USD"}
+
+    await worker.close()
+    await server.close()
+    await feed_hub.close()
+
+
+@pytest.mark.asyncio
+async def test_worker_skips_malformed_feed_lines(tmp_path):
+    path = str(tmp_path / "feed.sock")
+    good = serialize_ticker(MarketTicker("BTC-USD", 101.0, datetime.utcnow(), 0.0, 0.0))
+
+    async def feed(reader, writer):
+        await reader.readline()  # the worker's subscribe command
+        writer.write(b'{"symbol": "BTC-USD"}\nnot json\n' + good.encode() + b"\n")
+        await writer.drain()
+
+    server = await asyncio.start_unix_server(feed, path=path)
+    worker = RemotePriceHub(path, reconnect_delay=0.01)
+    outbox = ConflatingOutbox()
+    worker.subscribe("BTC-USD", outbox)
+
+    tick = await next_tick(outbox)
+    assert tick.ticker.price == 101.0
+
+    await worker.close()
+    server.close()
@@ -0,0 +1,116 @@
+import asyncio
+import json
+from datetime import datetime
+
+import pytest
+
+from app.domain.models import MarketTicker
+from app.infrastructure.price_hub import ConflatingOutbox, PriceHub
+
+
+@pytest.mark.asyncio
+async def test_hub_polls_once_per_symbol(provider):
+    hub = PriceHub(provider, interval=0.01)
+
+    outboxes = [ConflatingOutbox() for _ in range(50)]
+    for outbox in outboxes:
+        hub.subscribe("BTC-USD", outbox)
+    drained = [await asyncio.wait_for(o.drain(), timeout=1.0) for o in outboxes]
+
+    assert hub.active_symbols == {"BTC-USD"}
+    assert all(json.loads(ticks[0].message)["symbol"] == "BTC-USD" for _, ticks in drained)
+    # One upstream poll serves every subscriber
+    assert provider.calls < len(outboxes)
+    await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_hub_stops_poller_after_last_unsubscribe(provider):
+    hub = PriceHub(provider, interval=0.01)
+    first, second = ConflatingOutbox(), ConflatingOutbox()
+    hub.subscribe("ETH-USD", first)
+    hub.subscribe("ETH-USD", second)
+
+    hub.unsubscribe("ETH-USD", first)
+    assert hub.active_symbols == {"ETH-USD"}
+
+    hub.unsubscribe("ETH-USD", second)
+    assert hub.active_symbols == set()
+    assert hub.subscriber_count("ETH-USD") == 0
+
+
+@pytest.mark.asyncio
+async def test_outbox_keeps_only_latest_tick_per_symbol(provider):
+    hub = PriceHub(provider)
+    outbox = ConflatingOutbox()
+    hub._subscribers["BTC-USD"] = {outbox}
+    hub._subscribers["ETH-USD"] = {outbox}
+
+    # A slow client misses three BTC ticks; only the newest is delivered
+    for price in (1.0, 2.0, 3.0):
+        hub.publish(MarketTicker("BTC-USD", price, datetime.utcnow(), 0.0, 0.0))
+    hub.publish(MarketTicker("ETH-USD", 10.0, datetime.utcnow(), 0.0, 0.0))
+    outbox.notify({"t": "subscribed"})
+
+    control, ticks = await outbox.drain()
+    assert control == [{"t": "subscribed"}]
+    assert {t.symbol: t.ticker.price for t in ticks} == {"BTC-USD": 3.0, "ETH-USD": 10.0}
+    assert outbox.conflated == 2
+
+
+def test_multiplexed_websocket_streams_deltas(provider):
+    from fastapi.testclient import TestClient
+
+    from app.api import dependencies
+    from app.main import app
+
+    hub = PriceHub(provider, interval=0.01)
+    app.dependency_overrides[dependencies.get_price_hub] = lambda: hub
+    try:
+        with TestClient(app).websocket_connect("/api/v1/market/ws") as ws:
+            ws.send_json({"op": "subscribe", "symbols": ["BTC-USD", "ETH-USD"]})
+            assert ws.receive_json() == {"t": "subscribed", "symbols": ["BTC-USD", "ETH-USD"]}
+
+            seen = {}
+            while len(seen) < 2 or all(len(u) == 5 for u in seen.values()):
+                frame = ws.receive_json()
+                assert frame["t"] == "ticks"
+                for update in frame["d"]:
+                    seen[update["s"]] = update if update["s"] not in seen else {**update, "_delta": True}
+            # Later updates omit unchanged fields (change/volume stay 0.0)
+            assert any("c" not in u and "_delta" in u for u in seen.values())
+
+            ws.send_json({"op": "bogus"})
+            while (message := ws.receive_json())["t"] == "ticks":
+                pass
+            assert message["t"] == "error"
+    finally:
+        app.dependency_overrides.clear()
+    assert hub.active_symbols == set()
+
+
+def test_multiplexed_websocket_resubscribe_starts_with_full_update(provider):
+    from fastapi.testclient import TestClient
+
+    from app.api import dependencies
+    from app.main import app
+
+    def next_ticks(ws):
+        while (frame := ws.receive_json())["t"] != "ticks":
+            pass
+        return frame["d"]
+
+    hub = PriceHub(provider, interval=0.01)
+    app.dependency_overrides[dependencies.get_price_hub] = lambda: hub
+    try:
+        with TestClient(app).websocket_connect("/api/v1/market/ws") as ws:
+            ws.send_json({"op": "subscribe", "symbols": ["BTC-USD"]})
+            next_ticks(ws)
+            next_ticks(ws)
+            ws.send_json({"op": "unsubscribe", "symbols": ["BTC-USD"]})
+            while ws.receive_json()["t"] != "unsubscribed":
+                pass
+            ws.send_json({"op": "subscribe", "symbols": ["BTC-USD"]})
+            assert set(next_ticks(ws)[0]) == {"s", "p", "c", "v", "ts"}
+    finally:
+        app.dependency_overrides.clear()
@@ -0,0 +1,91 @@
+import httpx
+import pytest
+
+from app.infrastructure.resilience import (
+    AsyncCircuitBreaker, TokenBucket, CircuitBreakerError, RateLimitedError,
+    guarded_call, parse_retry_after, OPEN, CLOSED
+)
+
+
+async def failing():
+    raise httpx.ConnectError("boom")
+
+
+async def ok():
+    return httpx.Response(200)
+
+
+def too_many_requests(retry_after: str):
+    async def _call():
+        request = httpx.Request("GET", "https://api.example.com")
+        response = httpx.Response(429, headers={"Retry-After": retry_after}, request=request)
+        response.raise_for_status()
+    return _call
+
+
+@pytest.mark.asyncio
+async def test_breaker_counts_async_failures_and_opens():
+    breaker = AsyncCircuitBreaker("test", fail_max=2, reset_timeout=60)
+    for _ in range(2):
+        with pytest.raises(httpx.ConnectError):
+            await breaker.call(failing)
+
+    assert breaker.current_state == OPEN
+    with pytest.raises(CircuitBreakerError):
+        await breaker.call(ok)
+
+
+@pytest.mark.asyncio
+async def test_breaker_half_open_trial_closes_on_success():
+    breaker = AsyncCircuitBreaker("test", fail_max=1, reset_timeout=0)
+    with pytest.raises(httpx.ConnectError):
+        await breaker.call(failing)
+
+    # reset_timeout elapsed: one trial call goes through and closes the circuit
+    await breaker.call(ok)
+    assert breaker.current_state == CLOSED
+
+
+@pytest.mark.asyncio
+async def test_breaker_ignores_client_errors():
+    async def bad_request():
+        request = httpx.Request("GET", "https://api.example.com")
+        httpx.Response(400, request=request).raise_for_status()
+
+    breaker = AsyncCircuitBreaker("test", fail_max=1, reset_timeout=60)
+    for _ in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            await breaker.call(bad_request)
+
+    assert breaker.current_state == CLOSED
+    assert breaker.fail_counter == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refuses_instead_of_waiting_too_long():
+    bucket = TokenBucket("test", rate_per_minute=60, burst=2)
+    assert await bucket.acquire(max_wait=0)
+    assert await bucket.acquire(max_wait=0)
+    # Next token is ~1s away
+    assert not await bucket.acquire(max_wait=0.1)
+
+
+@pytest.mark.asyncio
+async def test_429_backs_off_without_tripping_breaker():
+    breaker = AsyncCircuitBreaker("test", fail_max=1, reset_timeout=60, excluded=(RateLimitedError,))
+    bucket = TokenBucket("test", rate_per_minute=600, burst=5)
+
+    with pytest.raises(RateLimitedError):
+        await guarded_call(breaker, bucket, too_many_requests("30"), max_wait=0)
+
+    assert breaker.current_state == CLOSED
+    assert bucket.rate_per_minute == 300
+    # Paused for Retry-After: callers fall back immediately
+    with pytest.raises(RateLimitedError):
+        await guarded_call(breaker, bucket, ok, max_wait=1.0)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("12") == 12.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
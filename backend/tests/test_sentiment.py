@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime
+from typing import List
+
+import pytest
+
+from app.domain.models import NewsItem
+from app.infrastructure.sentiment import SentimentCache, SentimentEnricher
+
+
+class CountingAI:
+    def __init__(self):
+        self.batches: List[List[str]] = []
+
+    async def analyze_sentiment_batch(self, texts: List[str]) -> List[float]:
+        self.batches.append(texts)
+        await asyncio.sleep(0)
+        return [0.5 for _ in texts]
+
+
+def make_item(i: int) -> NewsItem:
+    return NewsItem(
+        id=str(i),
+        title=f"Headline {i}",
+        url=f"https://example.com/{i}",
+        source="Test",
+        published_at=datetime.utcnow()
+    )
+
+
+@pytest.mark.asyncio
+async def test_enricher_batches_and_caches():
+    ai = CountingAI()
+    enricher = SentimentEnricher(ai, SentimentCache(), batch_size=4, max_concurrency=2)
+    items = [make_item(i) for i in range(10)]
+
+    enriched = await enricher.enrich(items)
+
+    assert [len(b) for b in ai.batches] == [4, 4, 2]
+    assert all(item.sentiment_score == 0.5 for item in enriched)
+    assert all(item.sentiment_label == "Bullish" for item in enriched)
+    # Originals are untouched
+    assert items[0].sentiment_score == 0.0
+
+    # Concurrent and repeated requests reuse scores
+    await asyncio.gather(enricher.enrich(items), enricher.enrich(items))
+    assert len(ai.batches) == 3
+
+
+@pytest.mark.asyncio
+async def test_sentiment_cache_persists(tmp_path):
+    path = str(tmp_path / "sentiment.sqlite3")
+    ai = CountingAI()
+    cache = SentimentCache(path)
+    await SentimentEnricher(ai, cache, batch_size=8, max_concurrency=1).enrich([make_item(1)])
+    cache.close()
+
+    reopened = SentimentEnricher(ai, SentimentCache(path), batch_size=8, max_concurrency=1)
+    enriched = await reopened.enrich([make_item(1)])
+
+    assert enriched[0].sentiment_score == 0.5
+    assert len(ai.batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_sentiment_cache_bounds_memory_and_reads_back_from_disk(tmp_path):
+    cache = SentimentCache(str(tmp_path / "sentiment.sqlite3"), max_entries=2)
+    await cache.put_many({"a": 0.1, "b": 0.2, "c": 0.3})
+
+    assert len(cache) == 2
+    assert cache.get("a") is None
+    assert await cache.get_many(["a", "c", "missing"]) == {"a": 0.1, "c": 0.3}
+    # Read-back scores are cached again, displacing the least recent
+    assert cache.get("a") == 0.1 and cache.get("b") is None
+    cache.close()
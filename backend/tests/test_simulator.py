@@ -0,0 +1,93 @@
+import numpy as np
+import pytest
+
+from app.infrastructure.simulator import MarketSimulator
+
+START = 1_700_000_000.0
+
+
+class FakeClock:
+    def __init__(self, now: float = START):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_simulator(clock: FakeClock, seed: int = 7, **kwargs) -> MarketSimulator:
+    return MarketSimulator(seed=seed, initial_prices={"BTC-USD": 45000.0}, clock=clock, **kwargs)
+
+
+def test_path_depends_only_on_seed_symbol_and_time():
+    clock_a, clock_b = FakeClock(), FakeClock()
+    a, b = make_simulator(clock_a), make_simulator(clock_b)
+
+    # b sees other symbols and is read at a different cadence; BTC must not notice
+    b.prices([f"SYM-{i}" for i in range(100)])
+    for _ in range(50):
+        clock_b.now += 60
+        b.price("BTC-USD")
+    clock_a.now = clock_b.now = START + 3000
+
+    assert a.price("BTC-USD") == b.price("BTC-USD")
+    assert a.history("BTC-USD", 2).prices.tolist() == b.history("BTC-USD", 2).prices.tolist()
+    assert make_simulator(FakeClock(clock_a.now), seed=8).price("BTC-USD") != a.price("BTC-USD")
+
+
+def test_ticker_matches_history():
+    clock = FakeClock()
+    sim = make_simulator(clock)
+    clock.now += 5 * 3600 + 12.5
+
+    ticker = sim.ticker("BTC-USD")
+    day = sim.history("BTC-USD", 1)
+
+    assert day.prices[-1] == ticker.price
+    assert day.timestamps[-1] == int(clock.now * 1000)
+    assert ticker.change_24h == round((ticker.price / day.prices[0] - 1) * 100, 2)
+    assert ticker.volume == pytest.approx(day.volumes[1:].sum(), abs=0.05)
+    assert np.all(np.diff(day.timestamps) > 0)
+
+
+def test_late_symbol_catches_up_by_bars_not_ticks():
+    clock = FakeClock()
+    sim = make_simulator(clock, tick_seconds=1.0)
+    clock.now += 7 * 86_400 + 1800
+    sim.advance()
+
+    simulated = []
+    original = sim._simulate
+    sim._simulate = lambda rows, first, last: simulated.append(last - first + 1) or original(rows, first, last)
+    ticker = sim.ticker("LATE-USD")
+    day = sim.history("LATE-USD", 1)
+
+    # Only the ticks of the current bar are replayed, not a week of them
+    assert len(simulated) == 1 and simulated[0] < 3600
+    assert day.prices[-1] == ticker.price
+    assert ticker.change_24h == round((ticker.price / day.prices[0] - 1) * 100, 2)
+    assert np.all(day.prices > 0)
+
+
+def test_history_covers_requested_days_up_to_ring_size():
+    sim = make_simulator(FakeClock(), history_days=7)
+
+    # Hourly bars plus the live point, capped at the ring
+    assert len(sim.history("ETH-USD", 1)) == 25
+    assert len(sim.history("ETH-USD", 30)) == 7 * 24 + 1
+    assert np.all(sim.history("ETH-USD", 7).prices > 0)
+
+
+def test_rejects_bars_that_are_not_whole_ticks():
+    with pytest.raises(ValueError):
+        MarketSimulator(tick_seconds=0.7, bar_seconds=3600, clock=FakeClock())
+
+
+def test_unknown_symbols_never_get_rows():
+    sim = make_simulator(FakeClock(), universe=["BTC-USD", "ETH-USD"])
+
+    for i in range(100):
+        assert f"SYM-{i}" not in sim
+        with pytest.raises(KeyError):
+            sim.price(f"SYM-{i}")
+    sim.prices(["BTC-USD", "ETH-USD"])
+    assert len(sim) == 2
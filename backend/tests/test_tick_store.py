@@ -0,0 +1,82 @@
+import os
+
+import numpy as np
+
+from app.infrastructure.tick_store import TickStore
+
+MINUTE = 60_000
+
+
+def test_append_and_range_query(tmp_path):
+    store = TickStore(str(tmp_path), bar_seconds=60, raw_retention_seconds=3600)
+    for i in range(100):
+        assert store.append("BTC-USD", i * 1000, 100.0 + i)
+    # Out-of-order ticks are rejected so files stay sorted
+    assert not store.append("BTC-USD", 50_000, 1.0)
+
+    records = store.query("BTC-USD", 10_000, 19_000)
+    assert records["ts"].tolist() == [i * 1000 for i in range(10, 20)]
+    assert records["price"][0] == 110.0
+
+
+def test_history_requires_full_coverage(tmp_path):
+    store = TickStore(str(tmp_path), bar_seconds=60, raw_retention_seconds=3600)
+    for i in range(60):
+        store.append("ETH-USD", i * MINUTE, 2000.0)
+
+    covered = store.history("ETH-USD", 0, 59 * MINUTE, max_gap_ms=2 * MINUTE)
+    assert covered is not None and len(covered) == 60
+
+    # Nothing recorded before t=0, so an earlier window must go upstream
+    assert store.history("ETH-USD", -30 * MINUTE, 59 * MINUTE, max_gap_ms=2 * MINUTE) is None
+
+
+def test_compaction_rolls_old_ticks_into_bars_and_survives_reopen(tmp_path):
+    store = TickStore(str(tmp_path), bar_seconds=60, raw_retention_seconds=600)
+    # Ticks every 10s for 30 minutes
+    for i in range(180):
+        store.append("SOL-USD", i * 10_000, float(i))
+
+    rolled = store.compact(now_ms=30 * MINUTE)
+    assert rolled == 120  # first 20 minutes
+
+    reopened = TickStore(str(tmp_path), bar_seconds=60, raw_retention_seconds=600)
+    records = reopened.query("SOL-USD", 0, 30 * MINUTE)
+    # 20 one-minute bars (closing tick of each) followed by the 60 recent raw ticks
+    assert len(records) == 80
+    assert records["ts"][:3].tolist() == [0, MINUTE, 2 * MINUTE]
+    assert records["price"][:3].tolist() == [5.0, 11.0, 17.0]
+    assert np.all(np.diff(records["ts"]) > 0)
+    assert not reopened.append("SOL-USD", 0, 1.0)
+
+
+def test_read_only_store_sees_writer_data_but_never_writes(tmp_path):
+    writer = TickStore(str(tmp_path), bar_seconds=60, raw_retention_seconds=600)
+    reader = TickStore(str(tmp_path), bar_seconds=60, raw_retention_seconds=600, read_only=True)
+    writer.append("BTC-USD", 1000, 100.0)
+
+    assert not reader.append("BTC-USD", 2000, 101.0)
+    assert reader.compact(10 * 3600 * 1000) == 0
+    assert reader.query("BTC-USD", 0, 5000)["price"].tolist() == [100.0]
+
+
+def test_reads_during_compaction_never_see_rolled_ticks_twice(tmp_path, monkeypatch):
+    writer = TickStore(str(tmp_path), bar_seconds=60, raw_retention_seconds=600)
+    reader = TickStore(str(tmp_path), bar_seconds=60, raw_retention_seconds=600, read_only=True)
+    for i in range(180):
+        writer.append("SOL-USD", i * 10_000, float(i))
+
+    # Read between the bars append and the raw file replacement
+    seen = []
+    replace = os.replace
+
+    def read_then_replace(src, dst):
+        seen.append(reader.query("SOL-USD", 0, 30 * MINUTE))
+        replace(src, dst)
+
+    monkeypatch.setattr(os, "replace", read_then_replace)
+    writer.compact(now_ms=30 * MINUTE)
+
+    assert len(seen[0]) == 80
+    assert np.all(np.diff(seen[0]["ts"]) > 0)
+    assert reader.history("SOL-USD", 0, 29 * MINUTE, max_gap_ms=MINUTE) is not None